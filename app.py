@@ -19,8 +19,9 @@ from flask_migrate import Migrate
 from models.site import Site
 from routes.superadmin import superadmin_bp
 from services.employee_service import synchronize_employee_id_sequence
+from sqlalchemy.pool import NullPool
 
-def create_app(register_blueprints: bool = True):
+def create_app(register_blueprints: bool = True, pooled: bool = True):
     app = Flask(__name__)
 
     # Disable strict slashes to avoid redirect issues with CORS
@@ -79,14 +80,24 @@ def create_app(register_blueprints: bool = True):
     app.config["SECRET_KEY"] = SECRET_KEY
 
     # SQLAlchemy Connection Pooling Configuration
-    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        'pool_size': 30,
-        'max_overflow': 50,
-        'pool_pre_ping': True,
-        'pool_recycle': 1800,
-        'pool_timeout': 60,
-        'echo': False
-    }
+    if SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        # SQLite (test runs) has no server connections to pool; let Flask-SQLAlchemy pick its pool
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'echo': False}
+    elif not pooled:
+        # One-shot scripts: open a connection per checkout and close it on release
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'poolclass': NullPool,
+            'echo': False
+        }
+    else:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': 30,
+            'max_overflow': 50,
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'pool_timeout': 60,
+            'echo': False
+        }
 
     # Ensure uploads dir exists
     os.makedirs(UPLOADS_DIR, exist_ok=True)
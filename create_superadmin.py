@@ -9,7 +9,7 @@ from models import db, User
 import uuid
 
 # Initialize app context
-app = create_app()
+app = create_app(register_blueprints=False, pooled=False)
 app.app_context().push()
 
 def create_superadmin(email, password):
@@ -284,7 +284,7 @@ def seed_wage_masters() -> None:
 
 def init_database(drop: bool, seed_demo: bool) -> int:
     # Use minimal app without registering blueprints to avoid heavy imports (pandas)
-    app = create_app(register_blueprints=False)
+    app = create_app(register_blueprints=False, pooled=False)
     
     with app.app_context():
         try:
@@ -153,13 +153,18 @@ def create_performance_indexes():
 
             # Deduction indexes
             "CREATE INDEX IF NOT EXISTS idx_deduction_employee_id ON deductions(employee_id)",
-            "CREATE INDEX IF NOT EXISTS idx_deduction_employee_active ON deductions(employee_id, start_month)",
+            "CREATE INDEX IF NOT EXISTS idx_deduction_employee_start_month ON deductions(employee_id, start_month)",
         ]
 
+        # One transaction for all indexes; a savepoint per statement keeps a
+        # single failure from aborting the rest on Postgres
         for index_sql in indexes:
+            savepoint = db.session.begin_nested()
             try:
                 db.session.execute(text(index_sql))
+                savepoint.commit()
             except Exception as e:
+                savepoint.rollback()
                 print(f"⚠️  Warning: Could not create index: {e}")
 
         db.session.commit()
@@ -307,9 +312,11 @@ def verify_setup():
     try:
         # Check tables exist
         tables_to_check = ['employees', 'attendance', 'users', 'departments', 'holidays', 'wage_masters', 'deductions']
-        for table in tables_to_check:
-            result = db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).fetchone()
-            print(f"✅ Table '{table}': {result[0]} records")
+        count_sql = " UNION ALL ".join(
+            f"SELECT '{table}', COUNT(*) FROM {table}" for table in tables_to_check
+        )
+        for table, count in db.session.execute(text(count_sql)).fetchall():
+            print(f"✅ Table '{table}': {count} records")
 
         # Check constraints
         constraint_result = db.session.execute(text("""
@@ -360,9 +367,12 @@ def drop_all_tables():
         ]
 
         for table in tables_to_drop:
+            savepoint = db.session.begin_nested()
             try:
                 db.session.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+                savepoint.commit()
             except Exception as e:
+                savepoint.rollback()
                 print(f"⚠️  Warning: Could not drop table {table}: {e}")
 
         # Drop sequences
@@ -381,7 +391,7 @@ def init_fresh_database(drop_tables=False, seed_demo=False, verify=True):
     """Main initialization function - similar to Prisma's db push"""
 
     # Use minimal app without blueprints
-    app = create_app(register_blueprints=False)
+    app = create_app(register_blueprints=False, pooled=False)
 
     with app.app_context():
         success = True
@@ -451,7 +461,7 @@ def init_fresh_database(drop_tables=False, seed_demo=False, verify=True):
 
 def check_database_status():
     """Check current database status"""
-    app = create_app(register_blueprints=False)
+    app = create_app(register_blueprints=False, pooled=False)
 
     with app.app_context():
         print("📊 Database Status Check")
@@ -462,13 +472,18 @@ def check_database_status():
             db.session.execute(text("SELECT 1"))
             print("✅ Database connection: OK")
 
-            # Check tables
+            # Check tables (look them up once rather than probing each with a
+            # failing SELECT, which would abort the transaction on Postgres)
             tables = ['employees', 'attendance', 'users', 'departments', 'holidays']
+            existing_tables = {row[0] for row in db.session.execute(text("""
+                SELECT table_name FROM information_schema.tables
+                WHERE table_schema = current_schema()
+            """))}
             for table in tables:
-                try:
+                if table in existing_tables:
                     result = db.session.execute(text(f"SELECT COUNT(*) FROM {table}")).fetchone()
                     print(f"✅ Table '{table}': {result[0]} records")
-                except Exception:
+                else:
                     print(f"❌ Table '{table}': Missing or inaccessible")
 
             # Check sequence
@@ -34,7 +34,6 @@ def upgrade():
         db.session.execute(text("""
             ALTER TABLE users DROP CONSTRAINT IF EXISTS users_role_check;
         """))
-        db.session.commit()
         print("✓ Constraint dropped")
         
         # Step 2: Add new CHECK constraint with admin1 and admin2
@@ -44,33 +43,32 @@ def upgrade():
             ADD CONSTRAINT users_role_check 
             CHECK (role IN ('superadmin', 'admin', 'admin1', 'admin2', 'hr', 'manager', 'supervisor', 'employee'));
         """))
-        db.session.commit()
         print("✓ New constraint added")
         
         # Step 3: Migrate existing 'admin' users to 'admin2' (Option B)
         print("Step 3: Migrating existing 'admin' users to 'admin2'...")
         
-        # First, count how many admins will be affected
-        result = db.session.execute(text("SELECT COUNT(*) FROM users WHERE role = 'admin'"))
-        admin_count = result.scalar()
-        print(f"Found {admin_count} admin user(s) to migrate...")
+        # A single UPDATE; its rowcount is the number of admins affected
+        result = db.session.execute(text("""
+            UPDATE users 
+            SET role = 'admin2', 
+                updated_date = NOW(),
+                updated_by = 'system_migration'
+            WHERE role = 'admin';
+        """))
+        admin_count = result.rowcount
         
         if admin_count > 0:
-            # Perform the migration
-            db.session.execute(text("""
-                UPDATE users 
-                SET role = 'admin2', 
-                    updated_date = NOW(),
-                    updated_by = 'system_migration'
-                WHERE role = 'admin';
-            """))
-            db.session.commit()
             print(f"✓ Successfully migrated {admin_count} admin user(s) to admin2")
             print("⚠️  NOTE: These users now have RESTRICTED access (cannot modify salary codes)")
             print("⚠️  To grant full access, manually update specific users to 'admin1'")
         else:
             print("No admin users found to migrate")
         
+        # All steps share one transaction: Postgres DDL is transactional, so a
+        # failure part-way never leaves users.role without a CHECK constraint
+        db.session.commit()
+        
         print("\n✅ Migration completed successfully!")
         print("\nNext steps:")
         print("1. Manually promote users who need salary code access to 'admin1':")
@@ -88,31 +86,22 @@ def downgrade():
     try:
         print("Starting rollback: Reverting admin1/admin2 to admin...")
         
-        # Count affected users
-        result = db.session.execute(text("""
-            SELECT COUNT(*) FROM users WHERE role IN ('admin1', 'admin2')
-        """))
-        count = result.scalar()
-        print(f"Found {count} user(s) with admin1/admin2 roles...")
-        
         # Revert admin1 and admin2 back to admin
         print("Reverting admin1/admin2 users to 'admin'...")
-        db.session.execute(text("""
+        result = db.session.execute(text("""
             UPDATE users 
             SET role = 'admin',
                 updated_date = NOW(),
                 updated_by = 'system_rollback'
             WHERE role IN ('admin1', 'admin2');
         """))
-        db.session.commit()
-        print(f"✓ Reverted {count} user(s) to 'admin'")
+        print(f"✓ Reverted {result.rowcount} user(s) to 'admin'")
         
         # Drop new constraint
         print("Dropping new CHECK constraint...")
         db.session.execute(text("""
             ALTER TABLE users DROP CONSTRAINT IF EXISTS users_role_check;
         """))
-        db.session.commit()
         
         # Restore original constraint
         print("Restoring original CHECK constraint...")
@@ -131,7 +120,11 @@ def downgrade():
         sys.exit(1)
 
 if __name__ == "__main__":
-    from app import app
+    os.environ['CREATE_APP_ON_IMPORT'] = '0'  # Prevent auto-creation of the full app
+    from app import create_app
+    
+    # Only the models are needed; skip blueprints (pandas etc.) and the pool
+    app = create_app(register_blueprints=False, pooled=False)
     
     with app.app_context():
         print("\n" + "="*60)
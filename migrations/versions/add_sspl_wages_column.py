@@ -17,21 +17,8 @@ depends_on = None
 
 
 def upgrade():
-    # Add sspl_wages column to wage_masters table
-    # Add sspl_wages column conditionally
-    op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_name='wage_masters' AND column_name='sspl_wages'
-            ) THEN
-                ALTER TABLE wage_masters ADD COLUMN sspl_wages FLOAT;
-            END IF;
-        END
-        $$;
-    """)
+    # Add sspl_wages column to wage_masters table (no-op if already present)
+    op.execute("ALTER TABLE wage_masters ADD COLUMN IF NOT EXISTS sspl_wages FLOAT;")
 
 def downgrade():
     # Remove sspl_wages column from wage_masters table
@@ -17,33 +17,11 @@ depends_on = None
 
 
 def upgrade():
-    # Add username column conditionally
+    # Add the username column and its unique index in one round-trip; the
+    # native IF NOT EXISTS clauses keep the migration safe to re-run
     op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1
-                FROM information_schema.columns
-                WHERE table_name='users' AND column_name='username'
-            ) THEN
-                ALTER TABLE users ADD COLUMN username VARCHAR(80);
-            END IF;
-        END
-        $$;
-    """)
-    # Create unique index for username conditionally
-    op.execute("""
-        DO $$
-        BEGIN
-            IF NOT EXISTS (
-                SELECT 1
-                FROM pg_indexes
-                WHERE indexname = 'ix_users_username'
-            ) THEN
-                CREATE UNIQUE INDEX ix_users_username ON users (username);
-            END IF;
-        END
-        $$;
+        ALTER TABLE users ADD COLUMN IF NOT EXISTS username VARCHAR(80);
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
     """)
 
 def downgrade():
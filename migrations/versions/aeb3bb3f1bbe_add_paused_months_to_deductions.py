@@ -17,15 +17,7 @@ depends_on = None
 
 
 def upgrade():
-    op.execute("""
-        DO $$ 
-        BEGIN
-            IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                           WHERE table_name='deductions' AND column_name='paused_months') THEN
-                ALTER TABLE deductions ADD COLUMN paused_months INTEGER DEFAULT 0 NOT NULL;
-            END IF;
-        END $$;
-    """)
+    op.execute("ALTER TABLE deductions ADD COLUMN IF NOT EXISTS paused_months INTEGER DEFAULT 0 NOT NULL;")
 
 def downgrade():
     op.drop_column('deductions', 'paused_months')
@@ -0,0 +1,27 @@
+"""Add deduction employee/start_month index
+
+Revision ID: c7d8e9f0a1b2
+Revises: aeb3bb3f1bbe
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d8e9f0a1b2'
+down_revision = 'aeb3bb3f1bbe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Supports the active-month deduction filter used by salary calculations
+    with op.batch_alter_table('deductions', schema=None) as batch_op:
+        batch_op.create_index('idx_deduction_employee_start_month', ['employee_id', 'start_month'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('deductions', schema=None) as batch_op:
+        batch_op.drop_index('idx_deduction_employee_start_month')
@@ -1,10 +1,17 @@
 from models import db
+from sqlalchemy import Index, and_, extract
 from sqlalchemy.sql import func
+from datetime import date
 import uuid
 
 class Deduction(db.Model):
     __tablename__ = "deductions"
 
+    __table_args__ = (
+        # Supports the per-employee active-month filter used by salary calculations
+        Index('idx_deduction_employee_start_month', 'employee_id', 'start_month'),
+    )
+
     deduction_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     employee_id = db.Column(db.Integer, db.ForeignKey("employees.employee_id"), nullable=False)
     deduction_type = db.Column(db.String(100), nullable=False)  # e.g., Clothes, Recovery, Loan
@@ -29,6 +36,16 @@ class Deduction(db.Model):
             return 0
         return float(self.total_amount) / self.months
 
+    @classmethod
+    def active_for_month_filter(cls, year, month):
+        """SQL equivalent of is_active_for_month, for use in query filters"""
+        next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        start_index = extract('year', cls.start_month) * 12 + extract('month', cls.start_month)
+        return and_(
+            cls.start_month < next_month,
+            start_index + cls.months + func.coalesce(cls.paused_months, 0) > year * 12 + month
+        )
+
     def is_active_for_month(self, year, month):
         """Check if deduction is active for the given month"""
         from datetime import date
@@ -60,7 +60,7 @@ def reset_sequence():
 
 if __name__ == '__main__':
     # Create Flask app without registering blueprints (for scripts)
-    app = create_app(register_blueprints=False)
+    app = create_app(register_blueprints=False, pooled=False)
 
     with app.app_context():
         success = reset_sequence()
@@ -14,9 +14,10 @@ import calendar
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from utils.attendance_helpers import round_to_half, normalize_attendance_value, is_date, parse_date_from_column
-from utils.file_validators import validate_excel_file, validate_excel_structure, validate_employee_data, validate_attendance_data
+from utils.attendance_helpers import round_to_half, normalize_attendance_series, is_date, parse_date_from_column, parse_date_columns, parse_overtime_column, is_attendance_upload_column, build_attendance_copy_buffer
+from utils.file_validators import validate_excel_file, validate_excel_structure, validate_employee_data, validate_attendance_data, find_employee_columns
 from utils.performance_utils import PerformanceMonitor, memory_efficient_gc, optimize_dataframe_memory
+from utils.excel_parser import detect_excel_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -61,6 +62,18 @@ def batch_load_existing_attendance(employee_ids, start_date, end_date):
     
     return existing_dict
 
+def copy_attendance_chunk(chunk):
+    """Stream a chunk of attendance mappings through PostgreSQL COPY in one round-trip"""
+    columns, buffer = build_attendance_copy_buffer(chunk)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Attendance.__tablename__} ({', '.join(columns)}) FROM STDIN",
+            buffer
+        )
+    finally:
+        cursor.close()
+
 def safe_bulk_insert(attendance_dicts, chunk_size=5000):
     """Safely insert attendance records in optimized chunks"""
     results = {
@@ -69,13 +82,20 @@ def safe_bulk_insert(attendance_dicts, chunk_size=5000):
         "errors": []
     }
 
+    # COPY skips the per-row bind/execute of INSERT; other backends keep bulk_insert_mappings
+    use_copy = db.session.get_bind().dialect.name == 'postgresql'
+
     try:
         # Process in larger chunks for better performance
         for i in range(0, len(attendance_dicts), chunk_size):
             chunk = attendance_dicts[i:i + chunk_size]
             try:
-                db.session.bulk_insert_mappings(Attendance, chunk)
-                db.session.flush()
+                # A savepoint per chunk: a failed chunk is undone alone, earlier chunks stay
+                with db.session.begin_nested():
+                    if use_copy:
+                        copy_attendance_chunk(chunk)
+                    else:
+                        db.session.bulk_insert_mappings(Attendance, chunk)
                 results["successful"] += len(chunk)
                 logger.info(f"Successfully processed chunk {i//chunk_size + 1}: {len(chunk)} records")
 
@@ -83,18 +103,15 @@ def safe_bulk_insert(attendance_dicts, chunk_size=5000):
                 memory_efficient_gc(400)
 
             except Exception as chunk_error:
-                db.session.rollback()
                 logger.error(f"Chunk {i//chunk_size + 1} failed: {str(chunk_error)}")
 
                 # Fallback: Try individual inserts for failed chunk
                 for record in chunk:
                     try:
-                        attendance = Attendance(**record)
-                        db.session.add(attendance)
-                        db.session.flush()
+                        with db.session.begin_nested():
+                            db.session.add(Attendance(**record))
                         results["successful"] += 1
                     except Exception as individual_error:
-                        db.session.rollback()
                         results["failed"] += 1
                         results["errors"].append(
                             f"Employee {record.get('employee_id', 'Unknown')}: {str(individual_error)}"
@@ -123,6 +140,7 @@ def process_employee_batch(batch_data):
     try:
         employee_ids = batch_data['employee_ids']
         date_columns = batch_data['date_columns']
+        dates_by_col = batch_data['dates_by_col']
         df_chunk = batch_data['df_chunk']
         employee_dict = batch_data['employee_dict']
         existing_attendance_dict = batch_data['existing_attendance_dict']
@@ -131,6 +149,11 @@ def process_employee_batch(batch_data):
         marked_by = batch_data['marked_by']
         current_user_email = batch_data['current_user_email']
 
+        # Optional monthly Overtime column, parsed for the whole chunk at once
+        overtime_by_row = parse_overtime_column(df_chunk['Overtime']) if 'Overtime' in df_chunk.columns else None
+        # Attendance cells normalized for the whole chunk; blank or unrecognised cells count as Absent
+        status_by_cell = df_chunk[date_columns].apply(normalize_attendance_series).fillna('Absent')
+
         # Process each employee in this batch
         for idx, row in df_chunk.iterrows():
             try:
@@ -143,36 +166,17 @@ def process_employee_batch(batch_data):
                     continue
 
                 # Process attendance for each date column
-                monthly_overtime_shifts = 0.0
-                if 'Overtime' in df_chunk.columns:
-                    try:
-                        raw_ot = row.get('Overtime')
-                        if pd.notna(raw_ot) and str(raw_ot).strip() != '':
-                            monthly_overtime_shifts = float(str(raw_ot).strip())
-                            monthly_overtime_shifts = round(monthly_overtime_shifts * 2) / 2.0
-                    except Exception:
-                        monthly_overtime_shifts = 0.0
+                monthly_overtime_shifts = overtime_by_row.at[idx] if overtime_by_row is not None else 0.0
 
                 first_working_day_processed = False
 
                 for col in date_columns:
                     try:
-                        cell_value = row[col]
-                        if pd.isna(cell_value) or str(cell_value).strip() == '':
-                            attendance_value = 'Absent'
-                        else:
-                            attendance_value = normalize_attendance_value(cell_value)
-                            if not attendance_value:
-                                attendance_value = 'Absent'
-
-                        # Parse date from column
-                        year_from_col, month_from_col, day_from_col = parse_date_from_column(col)
-                        if year_from_col and month_from_col and day_from_col:
-                            try:
-                                attendance_date = date(year_from_col, month_from_col, day_from_col)
-                            except ValueError:
-                                continue
+                        attendance_value = status_by_cell.at[idx, col]
 
+                        # Date of this column, parsed once per upload
+                        attendance_date = dates_by_col.get(col)
+                        if attendance_date:
                             # Calculate overtime for this day
                             day_overtime = 0.0
                             if monthly_overtime_shifts > 0 and attendance_value not in ['Absent', 'Leave', 'Holiday']:
@@ -236,25 +240,15 @@ def process_employee_batch(batch_data):
 
 def safe_read_excel(file_storage, **kwargs):
     """
-    Safely read Excel file with multiple engine attempts
+    Read an Excel file with the engine matching its content (one parse, no retries)
     """
-    engines = ['openpyxl', 'xlrd']
-
-    for engine in engines:
-        try:
-            # Reset file pointer
-            file_storage.seek(0)
-            return pd.read_excel(file_storage, engine=engine, **kwargs)
-        except Exception as e:
-            logger.warning(f"Failed to read with engine {engine}: {str(e)}")
-            continue
+    engine = detect_excel_engine(file_storage)
 
-    # If all engines fail, try without specifying engine
     try:
         file_storage.seek(0)
-        return pd.read_excel(file_storage, **kwargs)
+        return pd.read_excel(file_storage, engine=engine, **kwargs)
     except Exception as e:
-        logger.error(f"Failed to read Excel file with any engine: {str(e)}")
+        logger.error(f"Failed to read Excel file with engine {engine}: {str(e)}")
         raise ValueError(f"Unable to read Excel file. Please ensure it's a valid Excel file (.xlsx or .xls). Error: {str(e)}")
 
 
@@ -1234,7 +1228,8 @@ def bulk_mark_attendance_excel(current_user):
         file_data = BytesIO(file.read())
 
         try:
-            df = safe_read_excel(file_data, dtype=str)
+            # Only the columns the upload reads are materialised; extra metadata columns are skipped
+            df = safe_read_excel(file_data, dtype=str, usecols=is_attendance_upload_column)
         except Exception as e:
             validation_errors['file_errors'].append(f"Error reading Excel file: {str(e)}")
             return jsonify({
@@ -1259,15 +1254,7 @@ def bulk_mark_attendance_excel(current_user):
 
         # Find columns
         df.columns = df.columns.astype(str).str.strip()
-        employee_id_col = None
-        employee_name_col = None
-
-        for col in df.columns:
-            col_normalized = col.lower().replace(' ', '').replace('_', '')
-            if col_normalized in ['employeeid', 'empid', 'id']:
-                employee_id_col = col
-            if col_normalized in ['employeename', 'name', 'empname']:
-                employee_name_col = col
+        employee_id_col, employee_name_col = find_employee_columns(df.columns)
 
         # Clean employee IDs
         df[employee_id_col] = (
@@ -1395,16 +1382,9 @@ def bulk_mark_attendance_excel(current_user):
         # PHASE 8: Process Valid Data with Optimized Parallel Processing
         logger.info(f"Validation passed. Processing {valid_employee_count} employees with optimizations...")
 
-        # Parse all dates to determine date range
-        all_dates = set()
-        for col in date_columns:
-            year_from_col, month_from_col, day_from_col = parse_date_from_column(col)
-            if year_from_col and month_from_col and day_from_col:
-                try:
-                    attendance_date = date(year_from_col, month_from_col, day_from_col)
-                    all_dates.add(attendance_date)
-                except ValueError:
-                    continue
+        # Parse every date column once; used for the date range and for each cell below
+        dates_by_col = parse_date_columns(date_columns)
+        all_dates = set(dates_by_col.values())
 
         min_date = min(all_dates) if all_dates else date.today()
         max_date = max(all_dates) if all_dates else date.today()
@@ -1454,9 +1434,10 @@ def bulk_mark_attendance_excel(current_user):
                 batch_df = df[df[employee_id_col].isin(batch_employees)].copy()
 
                 employee_batches.append({
-                    'employee_ids': batch_employees,
+                    'employee_ids': set(batch_employees),  # per-row membership checks
                     'df_chunk': batch_df,
                     'date_columns': date_columns,
+                    'dates_by_col': dates_by_col,
                     'employee_dict': employee_dict,
                     'existing_attendance_dict': existing_attendance_dict,
                     'month': month,
@@ -1493,6 +1474,11 @@ def bulk_mark_attendance_excel(current_user):
             new_attendance_records = []
             updated_records = []
 
+            # Optional Overtime column, parsed for all rows at once
+            overtime_by_row = parse_overtime_column(df['Overtime']) if 'Overtime' in df.columns else None
+            # Attendance cells normalized for all rows; blank or unrecognised cells count as Absent
+            status_by_cell = df[date_columns].apply(normalize_attendance_series).fillna('Absent')
+
             # Process each row
             for index, row in df.iterrows():
                 try:
@@ -1510,38 +1496,18 @@ def bulk_mark_attendance_excel(current_user):
                     employee_processed = False
 
                     # Optional: read Overtime column
-                    monthly_overtime_shifts = 0.0
-                    if 'Overtime' in df.columns:
-                        try:
-                            raw_ot = row.get('Overtime')
-                            if pd.notna(raw_ot) and str(raw_ot).strip() != '':
-                                monthly_overtime_shifts = float(str(raw_ot).strip())
-                                monthly_overtime_shifts = round(monthly_overtime_shifts * 2) / 2.0
-                        except Exception:
-                            monthly_overtime_shifts = 0.0
+                    monthly_overtime_shifts = overtime_by_row.at[index] if overtime_by_row is not None else 0.0
 
                     # Process each date column for this employee
                     first_working_day_processed = False
                     for col in date_columns:
                         try:
-                            cell_value = row[col]
-
-                            # Don't skip empty - mark as Absent
-                            if pd.isna(cell_value) or str(cell_value).strip() == '':
-                                attendance_value = 'Absent'
-                            else:
-                                attendance_value = normalize_attendance_value(cell_value)
-                                if not attendance_value:
-                                    attendance_value = 'Absent'
-
-                            # Parse date from column
-                            year_from_col, month_from_col, day_from_col = parse_date_from_column(col)
-                            if year_from_col and month_from_col and day_from_col:
-                                try:
-                                    attendance_date = date(year_from_col, month_from_col, day_from_col)
-                                except ValueError:
-                                    continue
+                            # Empty cells are not skipped - they count as Absent
+                            attendance_value = status_by_cell.at[index, col]
 
+                            # Date of this column, parsed once per upload
+                            attendance_date = dates_by_col.get(col)
+                            if attendance_date:
                                 # Calculate overtime for this day
                                 day_overtime = 0.0
                                 if monthly_overtime_shifts > 0 and attendance_value not in ['Absent', 'Leave', 'Holiday']:
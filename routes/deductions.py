@@ -276,10 +276,12 @@ def bulk_upload_deductions(current_user):
         error_count = 0
         errors = []
         
-        for index, row in df.iterrows():
+        # Plain tuples in required_columns order; avoids building a Series per row
+        rows = df[required_columns].itertuples(name=None)
+        for index, raw_employee_id, deduction_type, total_amount, months, raw_start_month in rows:
             try:
                 # Validate employee exists
-                employee_id = str(row['Employee ID']).strip()
+                employee_id = str(raw_employee_id).strip()
                 employee = Employee.query.filter_by(employee_id=employee_id).first()
                 if not employee:
                     errors.append(f"Row {index + 1}: Employee {employee_id} not found")
@@ -288,10 +290,10 @@ def bulk_upload_deductions(current_user):
                 
                 # Parse start month
                 try:
-                    if pd.isna(row['Start Month']):
+                    if pd.isna(raw_start_month):
                         start_month = datetime.now().date()
                     else:
-                        start_month = pd.to_datetime(row['Start Month']).date()
+                        start_month = pd.to_datetime(raw_start_month).date()
                 except:
                     start_month = datetime.now().date()
                 
@@ -299,9 +301,9 @@ def bulk_upload_deductions(current_user):
                 deduction = Deduction(
                     deduction_id=str(uuid.uuid4()),
                     employee_id=employee_id,
-                    deduction_type=str(row['Deduction Type']).strip(),
-                    total_amount=float(row['Total Amount']),
-                    months=int(row['Months']),
+                    deduction_type=str(deduction_type).strip(),
+                    total_amount=float(total_amount),
+                    months=int(months),
                     start_month=start_month,
                     created_by='bulk_upload'
                 )
@@ -5,6 +5,7 @@ from models.employee import Employee
 from models.wage_master import WageMaster
 from models.department import Department
 from utils.upload import save_file
+from utils.excel_parser import detect_excel_engine
 from models.account_details import AccountDetails
 from routes.auth import token_required
 from sqlalchemy import text
@@ -338,19 +339,15 @@ def bulk_upload_optimized():
     CHUNK_SIZE = 500  # Process in batches of 500
     
     try:
-        # Read Excel file - try different approaches
+        # Read Excel file with the engine matching its content
+        engine = detect_excel_engine(file_path)
         try:
-            # First try with openpyxl
-            xl = pd.ExcelFile(file_path, engine='openpyxl')
-        except Exception as e1:
-            try:
-                # Fallback to xlrd for older .xls files
-                xl = pd.ExcelFile(file_path, engine='xlrd')
-            except Exception as e2:
-                return jsonify({
-                    "success": False,
-                    "message": f"Could not read Excel file. Tried openpyxl: {str(e1)}, xlrd: {str(e2)}"
-                }), 400
+            xl = pd.ExcelFile(file_path, engine=engine)
+        except Exception as e:
+            return jsonify({
+                "success": False,
+                "message": f"Could not read Excel file with engine {engine}: {str(e)}"
+            }), 400
 
         # Debug: Check all sheets
         print(f"DEBUG: Available sheets: {xl.sheet_names}")
@@ -9,8 +9,10 @@ from datetime import datetime, date
 import pandas as pd
 import io
 import calendar
+import logging
 
 forms_bp = Blueprint("forms", __name__)
+logger = logging.getLogger(__name__)
 
 @forms_bp.route("/form-b", methods=["GET", "OPTIONS"])
 def get_form_b_data():
@@ -45,7 +47,7 @@ def get_form_b_data():
             # URL decode the site parameter
             from urllib.parse import unquote
             decoded_site = unquote(site)
-            print(f"[DEBUG] Filtering by site: '{site}' -> '{decoded_site}'")
+            logger.debug("Filtering by site: %r -> %r", site, decoded_site)
 
             # Join with WageMaster to filter by site
             query = query.join(WageMaster, Employee.salary_code == WageMaster.salary_code)\
@@ -126,6 +128,12 @@ def get_form_b_data():
         # STEP 6: Build Form B rows from pre-calculated data (IN-MEMORY)
         # ============================================
         form_b_data = []
+        total_days_worked = 0
+        total_overtime = 0
+        total_earnings = 0
+        total_deductions = 0
+        total_other_recoveries = 0
+        total_net_payable = 0
 
         for idx, employee in enumerate(employees, 1):
             # Get pre-calculated data from bulk queries
@@ -179,24 +187,33 @@ def get_form_b_data():
 
             form_b_data.append(form_b_row)
 
+            total_days_worked += form_b_row["daysWorked"]
+            total_overtime += form_b_row["overtime"]
+            total_earnings += form_b_row["totalEarnings"]
+            total_deductions += form_b_row["deductions"]["total"]
+            total_other_recoveries += form_b_row["deductions"]["otherRecoveries"] or 0
+            total_net_payable += form_b_row["netPayable"]
+
         # Calculate totals
         totals = {
             "totalEmployees": len(form_b_data),
-            "totalDaysWorked": sum(row["daysWorked"] for row in form_b_data),
-            "totalOvertime": sum(row["overtime"] for row in form_b_data),
-            "totalEarnings": sum(row["totalEarnings"] for row in form_b_data),
-            "totalDeductions": sum(row["deductions"]["total"] for row in form_b_data),
-            "totalOtherRecoveries": sum(row["deductions"]["otherRecoveries"] or 0 for row in form_b_data),
-            "totalNetPayable": sum(row["netPayable"] for row in form_b_data)
+            "totalDaysWorked": total_days_worked,
+            "totalOvertime": total_overtime,
+            "totalEarnings": total_earnings,
+            "totalDeductions": total_deductions,
+            "totalOtherRecoveries": total_other_recoveries,
+            "totalNetPayable": total_net_payable
         }
 
         # Calculate performance metrics
         total_time = time.time() - start_time
 
         # Log performance metrics
-        print(f"[PERFORMANCE] Form B generated in {total_time:.2f}s for {len(employees)} employees")
-        print(f"[PERFORMANCE] Bulk salary: {bulk_salary_time:.3f}s, Attendance: {bulk_attendance_time:.3f}s, Deductions: {bulk_deductions_time:.3f}s, WageMaster: {wage_master_time:.3f}s")
-        print(f"[PERFORMANCE] Total queries: ~6 (was {len(employees)} * 8 = {len(employees) * 8})")
+        logger.debug("Form B generated in %.2fs for %d employees", total_time, len(employees))
+        logger.debug(
+            "Form B timings - bulk salary: %.3fs, attendance: %.3fs, deductions: %.3fs, wage master: %.3fs",
+            bulk_salary_time, bulk_attendance_time, bulk_deductions_time, wage_master_time,
+        )
 
         response = jsonify({
             "success": True,
@@ -276,7 +293,7 @@ def get_form_b_special_wages():
                 "totalNetPayable": 0
             } }), 200
 
-        employee_ids = [emp.employee_id for emp in employees]
+        employee_ids = {emp.employee_id for emp in employees}
 
         # Reuse SSPL calc for given employees using the service we already implemented for site/all
         sspl_bulk = SalaryService.generate_monthly_salary_data_sspl(year, month, None)
@@ -490,14 +507,14 @@ def download_form_b_excel():
             
             # Create DataFrame and write to Excel
             df = pd.DataFrame(excel_data)
-            df.to_excel(writer, sheet_name='Form B - Wages Register', index=False)
+            # Leave the first 5 rows free for the title block
+            df.to_excel(writer, sheet_name='Form B - Wages Register', index=False, startrow=5)
             
             # Get the workbook and worksheet for formatting
             workbook = writer.book
             worksheet = writer.sheets['Form B - Wages Register']
             
             # Add header information as requested by user
-            worksheet.insert_rows(1, 5)  # Insert 5 rows for headers
             worksheet['A1'] = "Form B"
             worksheet['A2'] = "Format For Wage Register"
             worksheet['A3'] = f"Rate of minimum Wages {datetime.now().strftime('%d/%m/%Y')}"
@@ -575,7 +592,7 @@ def get_form_d_data():
             # URL decode the site parameter
             from urllib.parse import unquote
             decoded_site = unquote(site)
-            print(f"[DEBUG] Filtering by site: '{site}' -> '{decoded_site}'")
+            logger.debug("Filtering by site: %r -> %r", site, decoded_site)
 
             # Join with WageMaster to filter by site
             query = query.join(WageMaster, Employee.salary_code == WageMaster.salary_code)\
@@ -639,6 +656,9 @@ def get_form_d_data():
         # STEP 5: Build Form D rows with ESIC calculations (IN-MEMORY)
         # ============================================
         form_d_data = []
+        total_no_of_days = 0
+        total_monthly_wages_sum = 0
+        total_ip_contribution = 0
 
         for idx, employee in enumerate(employees, 1):
             salary_data = salary_data_dict.get(employee.employee_id, {})
@@ -670,7 +690,7 @@ def get_form_d_data():
                 insurance_no = "Null"
             except Exception as e:
                 # Handle any other potential errors gracefully
-                print(f"[WARNING] Error fetching ESIC number for employee {employee.employee_id}: {str(e)}")
+                logger.warning("Error fetching ESIC number for employee %s: %s", employee.employee_id, e)
                 insurance_no = "Null"
 
             form_d_row = {
@@ -685,12 +705,16 @@ def get_form_d_data():
 
             form_d_data.append(form_d_row)
 
+            total_no_of_days += form_d_row["noOfDays"]
+            total_monthly_wages_sum += form_d_row["totalMonthlyWages"]
+            total_ip_contribution += form_d_row["ipContribution"]
+
         # Calculate totals
         totals = {
             "totalEmployees": len(form_d_data),
-            "totalDays": sum(row["noOfDays"] for row in form_d_data),
-            "totalMonthlyWages": sum(row["totalMonthlyWages"] for row in form_d_data),
-            "totalIpContribution": sum(row["ipContribution"] for row in form_d_data)
+            "totalDays": total_no_of_days,
+            "totalMonthlyWages": total_monthly_wages_sum,
+            "totalIpContribution": total_ip_contribution
         }
 
         # Calculate performance metrics
@@ -793,14 +817,14 @@ def download_form_d_excel():
 
             # Create DataFrame and write to Excel
             df = pd.DataFrame(excel_data)
-            df.to_excel(writer, sheet_name='Form D - ESIC', index=False)
+            # Leave the first 5 rows free for the title block
+            df.to_excel(writer, sheet_name='Form D - ESIC', index=False, startrow=5)
 
             # Get the workbook and worksheet for formatting
             workbook = writer.book
             worksheet = writer.sheets['Form D - ESIC']
 
             # Add header information
-            worksheet.insert_rows(1, 5)
             worksheet['A1'] = "Form D"
             worksheet['A2'] = "Employees' State Insurance Corporation (ESIC)"
             worksheet['A3'] = f"Wage Ceiling: ₹21,000 | Date: {datetime.now().strftime('%d/%m/%Y')}"
@@ -877,7 +901,7 @@ def get_form_c_data():
             # URL decode the site parameter
             from urllib.parse import unquote
             decoded_site = unquote(site)
-            print(f"[DEBUG] Filtering by site: '{site}' -> '{decoded_site}'")
+            logger.debug("Filtering by site: %r -> %r", site, decoded_site)
 
             # Join with WageMaster to filter by site
             query = query.join(WageMaster, Employee.salary_code == WageMaster.salary_code)\
@@ -941,6 +965,15 @@ def get_form_c_data():
         # STEP 5: Build Form C rows with EPF calculations (IN-MEMORY)
         # ============================================
         form_c_data = []
+        total_gross_wages = 0
+        total_epf_wages = 0
+        total_eps_wages = 0
+        total_edli_wages = 0
+        total_epf_contribution = 0
+        total_eps_contribution = 0
+        total_epf_eps_diff = 0
+        total_ncp_days = 0
+        total_refund_of_advance = 0
 
         for idx, employee in enumerate(employees, 1):
             salary_data = salary_data_dict.get(employee.employee_id, {})
@@ -984,18 +1017,28 @@ def get_form_c_data():
 
             form_c_data.append(form_c_row)
 
+            total_gross_wages += form_c_row["grossWages"]
+            total_epf_wages += form_c_row["epfWages"]
+            total_eps_wages += form_c_row["epsWages"]
+            total_edli_wages += form_c_row["edliWages"]
+            total_epf_contribution += form_c_row["epfContribution"]
+            total_eps_contribution += form_c_row["epsContribution"]
+            total_epf_eps_diff += form_c_row["epfEpsDiff"]
+            total_ncp_days += form_c_row["ncpDays"]
+            total_refund_of_advance += form_c_row["refundOfAdvance"]
+
         # Calculate totals
         totals = {
             "totalEmployees": len(form_c_data),
-            "totalGrossWages": sum(row["grossWages"] for row in form_c_data),
-            "totalEpfWages": sum(row["epfWages"] for row in form_c_data),
-            "totalEpsWages": sum(row["epsWages"] for row in form_c_data),
-            "totalEdliWages": sum(row["edliWages"] for row in form_c_data),
-            "totalEpfContribution": sum(row["epfContribution"] for row in form_c_data),
-            "totalEpsContribution": sum(row["epsContribution"] for row in form_c_data),
-            "totalEpfEpsDiff": sum(row["epfEpsDiff"] for row in form_c_data),
-            "totalNcpDays": sum(row["ncpDays"] for row in form_c_data),
-            "totalRefundOfAdvance": sum(row["refundOfAdvance"] for row in form_c_data)
+            "totalGrossWages": total_gross_wages,
+            "totalEpfWages": total_epf_wages,
+            "totalEpsWages": total_eps_wages,
+            "totalEdliWages": total_edli_wages,
+            "totalEpfContribution": total_epf_contribution,
+            "totalEpsContribution": total_eps_contribution,
+            "totalEpfEpsDiff": total_epf_eps_diff,
+            "totalNcpDays": total_ncp_days,
+            "totalRefundOfAdvance": total_refund_of_advance
         }
 
         # Calculate performance metrics
@@ -1108,14 +1151,14 @@ def download_form_c_excel():
 
             # Create DataFrame and write to Excel
             df = pd.DataFrame(excel_data)
-            df.to_excel(writer, sheet_name='Form C - EPF', index=False)
+            # Leave the first 5 rows free for the title block
+            df.to_excel(writer, sheet_name='Form C - EPF', index=False, startrow=5)
 
             # Get the workbook and worksheet for formatting
             workbook = writer.book
             worksheet = writer.sheets['Form C - EPF']
 
             # Add header information
-            worksheet.insert_rows(1, 5)
             worksheet['A1'] = "Form C"
             worksheet['A2'] = "Employees' Provident Fund (EPF)"
             worksheet['A3'] = f"Wage Ceiling: ₹15,000 | Date: {datetime.now().strftime('%d/%m/%Y')}"
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, send_file, current_app
 from functools import wraps
 from io import BytesIO
 from datetime import datetime
+import logging
 import os
 
 from models.employee import Employee
@@ -18,6 +19,7 @@ from reportlab.pdfbase.ttfonts import TTFont
 
 
 id_cards_bp = Blueprint("id_cards", __name__)
+logger = logging.getLogger(__name__)
 
 
 def require_admin_or_superadmin(f):
@@ -63,7 +65,7 @@ def preview_bulk(current_user):
         site_id = request.args.get("site_id")
         employee_ids = request.args.getlist("employee_ids[]") or request.args.getlist("employee_ids")
 
-        print(f"DEBUG: site_id={site_id}, employee_ids={employee_ids}")
+        logger.debug("site_id=%s, employee_ids=%s", site_id, employee_ids)
 
         query = Employee.query
 
@@ -73,21 +75,21 @@ def preview_bulk(current_user):
             from models.wage_master import WageMaster
 
             site = Site.query.filter_by(site_id=site_id).first()
-            print(f"DEBUG: Site found: {site.site_name if site else 'None'}")
+            logger.debug("Site found: %s", site.site_name if site else None)
 
             if site:
                 # Get all salary codes for this site
                 site_salary_codes = WageMaster.query.filter_by(site_name=site.site_name).all()
                 salary_code_list = [sc.salary_code for sc in site_salary_codes]
-                print(f"DEBUG: Salary codes for site: {salary_code_list}")
+                logger.debug("Salary codes for site: %s", salary_code_list)
 
                 # Filter employees by salary codes
                 if salary_code_list:
                     query = query.filter(Employee.salary_code.in_(salary_code_list))
-                    print(f"DEBUG: Applied salary code filter: {salary_code_list}")
+                    logger.debug("Applied salary code filter: %s", salary_code_list)
                 else:
                     # No salary codes found for this site, return empty
-                    print("DEBUG: No salary codes found for site, returning empty")
+                    logger.debug("No salary codes found for site, returning empty")
                     return jsonify({
                         "success": True,
                         "data": {
@@ -97,7 +99,7 @@ def preview_bulk(current_user):
                     }), 200
             else:
                 # Site not found, return empty
-                print("DEBUG: Site not found, returning empty")
+                logger.debug("Site not found, returning empty")
                 return jsonify({
                     "success": True,
                     "data": {
@@ -109,19 +111,17 @@ def preview_bulk(current_user):
         # Handle custom employee selection
         if employee_ids:
             query = query.filter(Employee.employee_id.in_(employee_ids))
-            print(f"DEBUG: Filtering by employee_ids: {employee_ids}")
+            logger.debug("Filtering by employee_ids: %s", employee_ids)
 
         employees = query.all()
-        print(f"DEBUG: Found {len(employees)} employees")
+        logger.debug("Found %d employees", len(employees))
 
         previews = [_employee_to_preview(e) for e in employees]
-        print(f"DEBUG: Generated {len(previews)} previews")
+        logger.debug("Generated %d previews", len(previews))
 
         return jsonify({"success": True, "data": {"count": len(previews), "employees": previews}}), 200
     except Exception as e:
-        print(f"DEBUG: Error in preview_bulk: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in preview_bulk: %s", e)
         return jsonify({"success": False, "message": str(e)}), 500
 
 
@@ -131,15 +131,15 @@ def _draw_logo(c, x, y, size_mm=12):
     # Hardcoded absolute path to the logo (most reliable approach)
     logo_path = os.path.join(current_app.root_path, 'static', 'assets', 'SSPL.png')
 
-    print(f"DEBUG: Using hardcoded logo path: {logo_path}")
-    print(f"DEBUG: Logo file exists: {os.path.exists(logo_path)}")
+    logo_exists = os.path.exists(logo_path)
+    logger.debug("Using hardcoded logo path: %s (exists: %s)", logo_path, logo_exists)
 
-    if os.path.exists(logo_path):
+    if logo_exists:
         try:
             # Try to open and validate the image first
             from PIL import Image
             img = Image.open(logo_path)
-            print(f"DEBUG: PIL opened image successfully: {img.format}, size: {img.size}")
+            logger.debug("PIL opened image successfully: %s, size: %s", img.format, img.size)
 
             # Now try ReportLab
             c.drawImage(
@@ -151,15 +151,13 @@ def _draw_logo(c, x, y, size_mm=12):
                 preserveAspectRatio=True,
                 mask='auto',
             )
-            print(f"DEBUG: Successfully loaded logo from: {logo_path}")
+            logger.debug("Successfully loaded logo from: %s", logo_path)
             return True
         except Exception as e:
-            print(f"DEBUG: Failed to load logo from {logo_path}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Failed to load logo from %s: %s", logo_path, e, exc_info=True)
 
     # Fallback: Draw SSPL text in white box
-    print("DEBUG: No logo found, using text fallback")
+    logger.debug("No logo found, using text fallback")
     c.setFillColor(colors.white)
     c.rect(x, y, logo_size, logo_size, fill=1, stroke=1)
     c.setFont("Helvetica-Bold", 8)
@@ -379,7 +377,7 @@ def generate_bulk(current_user):
         employee_ids = data.get("employee_ids") or []
         site_id = data.get("site_id")
 
-        print(f"DEBUG: generate_bulk - mode={mode}, site_id={site_id}, employee_ids={employee_ids}")
+        logger.debug("generate_bulk - mode=%s, site_id=%s, employee_ids=%s", mode, site_id, employee_ids)
 
         query = Employee.query
 
@@ -389,18 +387,18 @@ def generate_bulk(current_user):
             from models.wage_master import WageMaster
 
             site = Site.query.filter_by(site_id=site_id).first()
-            print(f"DEBUG: Site found: {site.site_name if site else 'None'}")
+            logger.debug("Site found: %s", site.site_name if site else None)
 
             if site:
                 # Get all salary codes for this site
                 site_salary_codes = WageMaster.query.filter_by(site_name=site.site_name).all()
                 salary_code_list = [sc.salary_code for sc in site_salary_codes]
-                print(f"DEBUG: Salary codes for site: {salary_code_list}")
+                logger.debug("Salary codes for site: %s", salary_code_list)
 
                 # Filter employees by salary codes
                 if salary_code_list:
                     query = query.filter(Employee.salary_code.in_(salary_code_list))
-                    print(f"DEBUG: Applied salary code filter: {salary_code_list}")
+                    logger.debug("Applied salary code filter: %s", salary_code_list)
                 else:
                     return jsonify({
                         "success": False,
@@ -415,7 +413,7 @@ def generate_bulk(current_user):
             query = query.filter(Employee.employee_id.in_(employee_ids))
 
         employees = query.all()
-        print(f"DEBUG: Found {len(employees)} employees for PDF generation")
+        logger.debug("Found %d employees for PDF generation", len(employees))
 
         if not employees:
             return jsonify({
@@ -435,9 +433,7 @@ def generate_bulk(current_user):
             download_name=filename,
         )
     except Exception as e:
-        print(f"Error in generate_bulk: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in generate_bulk: %s", e)
         return jsonify({"success": False, "message": str(e)}), 500
 
 
@@ -11,8 +11,8 @@ from routes.auth import token_required
 from datetime import datetime, date
 import json
 import os
-import tempfile
 import uuid
+from io import BytesIO
 import logging
 from functools import wraps
 from sqlalchemy import func
@@ -42,6 +42,22 @@ except ImportError:
 
 payroll_bp = Blueprint('payroll', __name__)
 
+# Payslip template constants, built once instead of on every payslip
+PAYSLIP_MONTH_ABBRS = ['', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+                       'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+# Salary fields rendered explicitly (or not at all); any other positive field is a
+# dynamic deduction. Overtime detail fields are not deductions.
+PAYSLIP_FIXED_FIELDS = frozenset([
+    'Employee ID', 'Employee Name', 'Skill Level', 'Present Days', 'Daily Wage',
+    'Basic', 'Leave Wages', 'National & Festival', 'Special Basic', 'DA', 'HRA', 'Overtime', 'Overtime Allowance', 'Others', 'Total Earnings',
+    'PF', 'ESIC', 'Society', 'Income Tax', 'Insurance', 'Others Recoveries',
+    'Total Deductions', 'Net Salary',
+    'Overtime Shifts', 'Overtime Hours', 'Overtime Rate Hourly',
+])
+# The pre-calculated (SSPL) payslip also renders Other Deduction explicitly
+PAYSLIP_FROM_DATA_FIXED_FIELDS = PAYSLIP_FIXED_FIELDS | {'Other Deduction'}
+
 def require_admin_or_supervisor(f):
     """Decorator to ensure only Admin or Supervisor can access payroll endpoints"""
     @wraps(f)
@@ -134,9 +150,7 @@ def generate_payslip_html(employee_data, year, month):
             return "0.00"
     
     # Get month name
-    month_names = ['', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
-                   'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-    month_name = month_names[month] if 1 <= month <= 12 else 'UNK'
+    month_name = PAYSLIP_MONTH_ABBRS[month] if 1 <= month <= 12 else 'UNK'
     
     # Build earnings list with better organization - show all standard components
     earnings = []
@@ -192,12 +206,8 @@ def generate_payslip_html(employee_data, year, month):
     
     # Add dynamic deductions from the deductions module (with shorter names)
     # Exclude overtime-related fields that are not deductions
-    overtime_fields_to_exclude = ['Overtime Shifts', 'Overtime Hours', 'Overtime Rate Hourly']
     for key, value in salary_data.items():
-        if key not in ['Employee ID', 'Employee Name', 'Skill Level', 'Present Days', 'Daily Wage',
-                       'Basic', 'Leave Wages', 'National & Festival', 'Special Basic', 'DA', 'HRA', 'Overtime', 'Overtime Allowance', 'Others', 'Total Earnings',
-                       'PF', 'ESIC', 'Society', 'Income Tax', 'Insurance', 'Others Recoveries',
-                       'Total Deductions', 'Net Salary'] + overtime_fields_to_exclude and float(value) > 0:
+        if key not in PAYSLIP_FIXED_FIELDS and float(value) > 0:
             # Truncate long names for better fit
             short_name = key[:10] + "..." if len(key) > 10 else key
             deductions.append((short_name, value))
@@ -324,9 +334,7 @@ def generate_payslip_html_from_data(salary_data):
         month = current_date.month
         year = current_date.year
 
-        month_names = ['', 'JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
-                      'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-        month_name = month_names[month] if 1 <= month <= 12 else 'UNK'
+        month_name = PAYSLIP_MONTH_ABBRS[month] if 1 <= month <= 12 else 'UNK'
 
         # Format amounts with better handling
         def format_amount(amount):
@@ -393,12 +401,8 @@ def generate_payslip_html_from_data(salary_data):
 
         # Add dynamic deductions from the deductions module (with shorter names)
         # Exclude overtime-related fields that are not deductions
-        overtime_fields_to_exclude = ['Overtime Shifts', 'Overtime Hours', 'Overtime Rate Hourly']
         for key, value in salary_data.items():
-            if key not in ['Employee ID', 'Employee Name', 'Skill Level', 'Present Days', 'Daily Wage',
-                          'Basic', 'Leave Wages', 'National & Festival', 'Special Basic', 'DA', 'HRA', 'Overtime', 'Overtime Allowance', 'Others', 'Total Earnings',
-                          'PF', 'ESIC', 'Society', 'Income Tax', 'Insurance', 'Others Recoveries', 'Other Deduction',
-                          'Total Deductions', 'Net Salary'] + overtime_fields_to_exclude and float(value) > 0:
+            if key not in PAYSLIP_FROM_DATA_FIXED_FIELDS and float(value) > 0:
                 # Truncate long names for better fit
                 short_name = key[:10] + "..." if len(key) > 10 else key
                 deductions.append((short_name, value))
@@ -765,9 +769,9 @@ def detect_server_environment():
     
 
 
-def generate_pdf_from_html(html_content: str, filename: str) -> str:
-    """Generate PDF using pdf_service"""
-    return generate_payroll_pdf(html_content, filename)
+def generate_pdf_from_html(html_content: str) -> BytesIO:
+    """Generate PDF in memory using pdf_service"""
+    return generate_payroll_pdf(html_content)
 
 @payroll_bp.route('/preview', methods=['GET'])
 @token_required
@@ -958,14 +962,14 @@ def generate_payroll(current_user):
         # Generate PDF with better error handling
         pdf_generation_start = time.time()
         try:
-            pdf_path = generate_pdf_from_html(html_content, filename)
+            pdf_buffer = generate_pdf_from_html(html_content)
             pdf_generation_time = time.time() - pdf_generation_start
 
             total_time = time.time() - start_time
 
             # Return PDF file with performance metrics in headers
             response = send_file(
-                pdf_path,
+                pdf_buffer,
                 as_attachment=True,
                 download_name=filename,
                 mimetype='application/pdf'
@@ -1135,12 +1139,12 @@ def generate_payroll_sspl(current_user):
 
         pdf_start = time.time()
         try:
-            pdf_path = generate_pdf_from_html(html_content, filename)
+            pdf_buffer = generate_pdf_from_html(html_content)
             pdf_time = time.time() - pdf_start
             total_time = time.time() - start_time
 
             response = send_file(
-                pdf_path,
+                pdf_buffer,
                 as_attachment=True,
                 download_name=filename,
                 mimetype='application/pdf'
@@ -1299,8 +1303,8 @@ def test_payroll(current_user):
         
         pdf_test_result = "Not tested"
         try:
-            pdf_path = generate_pdf_from_html(test_html, "test.pdf")
-            pdf_test_result = f"Success: {pdf_path}"
+            pdf_buffer = generate_pdf_from_html(test_html)
+            pdf_test_result = f"Success: {pdf_buffer.getbuffer().nbytes} bytes"
         except Exception as pdf_e:
             pdf_test_result = f"Failed: {str(pdf_e)}"
         
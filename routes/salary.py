@@ -2,10 +2,36 @@ from flask import Blueprint, request, jsonify
 from services.salary_service import SalaryService
 import pandas as pd
 import io
-from openpyxl.styles import NamedStyle
+from functools import lru_cache
+from openpyxl import Workbook
+from openpyxl.styles import NamedStyle, Font
 
 salary_bp = Blueprint("salary", __name__)
 
+@lru_cache(maxsize=None)
+def _template_workbook(sheet_name, columns, rows):
+    """
+    Build a small sample-data template straight with openpyxl
+    The templates are constant, so each one is rendered once per process
+    Returns the .xlsx file content as bytes
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_name
+    ws.append(columns)
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+    for row in rows:
+        ws.append(row)
+
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+def _template_rows(template_data):
+    """Split a {column: values} template into hashable (columns, rows) tuples"""
+    return tuple(template_data), tuple(zip(*template_data.values()))
+
 @salary_bp.route("/upload", methods=["POST"])
 def upload_excel():
     """
@@ -236,16 +262,9 @@ def download_attendance_template():
             'Note': ['Wage rates are fetched from employee salary codes', '', '']
         }
 
-        df = pd.DataFrame(template_data)
-
-        # Create Excel file in memory
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Attendance', index=False)
-
-        output.seek(0)
+        columns, rows = _template_rows(template_data)
 
-        return output.getvalue(), 200, {
+        return _template_workbook('Attendance', columns, rows), 200, {
             'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             'Content-Disposition': 'attachment; filename=attendance_template.xlsx'
         }
@@ -276,16 +295,9 @@ def download_adjustments_template():
             'Others Recoveries': [200, 100, 150]
         }
 
-        df = pd.DataFrame(template_data)
-
-        # Create Excel file in memory
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Adjustments', index=False)
+        columns, rows = _template_rows(template_data)
 
-        output.seek(0)
-
-        return output.getvalue(), 200, {
+        return _template_workbook('Adjustments', columns, rows), 200, {
             'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             'Content-Disposition': 'attachment; filename=adjustments_template.xlsx'
         }
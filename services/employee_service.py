@@ -1,4 +1,4 @@
-from sqlalchemy import and_, text
+from sqlalchemy import and_, insert, text
 from models import db
 from models.employee import Employee
 from models.wage_master import WageMaster
@@ -6,7 +6,28 @@ from models.account_details import AccountDetails
 from models.site import Site
 from datetime import datetime
 
+# Rows per bulk INSERT in bulk_import_from_frames
+BULK_IMPORT_BATCH_SIZE = 1000
+
 def create_employee(payload: dict) -> Employee:
+    employee_values, account_values = _employee_values(payload)
+
+    emp = Employee(**employee_values)
+    db.session.add(emp)
+    db.session.flush()  # Get the auto-generated employee ID
+
+    # Create account details if bank information is provided
+    if account_values:
+        db.session.add(AccountDetails(emp_id=emp.employee_id, **account_values))
+
+    db.session.commit()
+    return emp
+
+def _employee_values(payload: dict) -> tuple:
+    """
+    Resolve the salary code and coerce fields of an employee payload.
+    Returns (employee column values, account detail values or None)
+    """
     # Get salary code from payload or create if wage master details are provided
     salary_code = payload.get("salary_code")
     if not salary_code and all(k in payload for k in ("site_name", "rank", "state", "base_salary")):
@@ -28,7 +49,7 @@ def create_employee(payload: dict) -> Employee:
     date_of_birth = _parse_date(payload.get("date_of_birth"))
     hire_date = _parse_date(payload.get("hire_date") or payload.get("date_of_joining"))
 
-    emp = Employee(
+    employee_values = dict(
         # Note: employee_id will be auto-generated by the sequence
         first_name=payload.get("first_name", ""),
         last_name=payload.get("last_name", ""),
@@ -76,23 +97,17 @@ def create_employee(payload: dict) -> Employee:
         created_by=payload.get("created_by", "system")
     )
 
-    db.session.add(emp)
-    db.session.flush()  # Get the auto-generated employee ID
-
-    # Create account details if bank information is provided
+    account_values = None
     if payload.get("bank_account_number") and payload.get("ifsc_code"):
-        account_details = AccountDetails(
-            emp_id=emp.employee_id,
+        account_values = dict(
             account_number=payload.get("bank_account_number"),
             ifsc_code=payload.get("ifsc_code"),
             bank_name=payload.get("bank_name"),
             branch_name=payload.get("branch_name"),
             created_by=payload.get("created_by", "system")
         )
-        db.session.add(account_details)
 
-    db.session.commit()
-    return emp
+    return employee_values, account_values
 
 def _get_or_create_wage_master(site_name: str, rank: str, state: str, base_salary, skill_level="Skilled"):
     # Exact match
@@ -211,87 +226,127 @@ def _get_site_name_from_work_location(work_location):
     # If no match found, return the work_location as is (might need manual mapping)
     return work_location
 
-def bulk_import_from_frames(sheet_frames: dict) -> dict:
+# Spreadsheet columns read by bulk_import_from_frames, per detected format
+OLD_FORMAT_COLUMNS = [
+    "Full Name", "Date of Birth", "Gender", "Site Name", "Rank", "State", "Base Salary",
+]
+
+# New format (payload key, column) pairs read as optional stripped text
+NEW_FORMAT_TEXT_FIELDS = [
+    ("gender", "Gender"),
+    ("marital_status", "Marital Status"),
+    ("blood_group", "Blood Group"),
+    ("address", "Permanent Address"),
+    ("phone_number", "Mobile Number"),
+    ("alternate_contact_number", "Alternate Contact Number"),
+    ("adhar_number", "Aadhaar Number"),
+    ("pan_card_number", "PAN Card Number"),
+    ("voter_id_driving_license", "Voter ID / Driving License"),
+    ("uan", "UAN"),
+    ("esic_number", "ESIC Number"),
+    ("employment_type", "Employment Type"),
+    ("department_id", "Department"),
+    ("designation", "Designation"),
+    ("reporting_manager", "Reporting Manager"),
+    ("skill_category", "Skill Category"),
+    ("salary_advance_loan", "Salary Advance/Loan"),
+    ("experience_duration", "Experience Duration"),
+    ("highest_qualification", "Highest Qualification"),
+    ("year_of_passing", "Year of Passing"),
+    ("additional_certifications", "Additional Certifications"),
+    ("emergency_contact_name", "Emergency Contact Name"),
+    ("emergency_contact_relationship", "Emergency Relationship"),
+    ("emergency_contact_phone", "Emergency Phone Number"),
+    ("salary_code", "Salary Code"),
+    ("bank_account_number", "Bank Account Number"),
+    ("bank_name", "Bank Name"),
+    ("ifsc_code", "IFSC Code"),
+]
+
+NEW_FORMAT_BOOL_FIELDS = [
+    ("pf_applicability", "PF Applicability"),
+    ("esic_applicability", "ESIC Applicability"),
+    ("professional_tax_applicability", "Professional Tax Applicability"),
+]
+
+NEW_FORMAT_COLUMNS = (
+    ["Full Name", "Date of Birth", "Date of Joining", "Work Location", "Nationality"]
+    + [column for _, column in NEW_FORMAT_TEXT_FIELDS]
+    + [column for _, column in NEW_FORMAT_BOOL_FIELDS]
+)
+
+def _cell_str(value):
+    """Stripped string of a cell, or None for empty (NaN) cells"""
+    return str(value).strip() if not pd_isna(value) else None
+
+def _cell_text(value, default=None):
+    """Stripped string of a cell, or default for empty, NaN or falsy cells"""
+    return str(value).strip() if value and not pd_isna(value) else default
+
+def bulk_import_from_frames(sheet_frames) -> dict:
     """
-    sheet_frames: dict {sheet_name: DataFrame}
+    sheet_frames: dict {sheet_name: DataFrame}, or an iterable of (sheet_name, DataFrame)
+                  pairs such as utils.excel_parser.iter_excel_frames() to stream sheet by sheet
     Returns a summary: {"inserted": n, "errors": [row_error, ...]}
     """
     from utils.excel_parser import detect_excel_format
 
     summary = {"inserted": 0, "errors": []}
+    pending = []
 
-    for sheet, df in sheet_frames.items():
+    sheets = sheet_frames.items() if isinstance(sheet_frames, dict) else sheet_frames
+    for sheet, df in sheets:
         # Detect format for this sheet
         format_type = detect_excel_format(df)
 
-        for idx, row in df.iterrows():
+        # Resolve every column position once per sheet; rows are then read
+        # positionally from a plain object array instead of a per-row Series.
+        columns = OLD_FORMAT_COLUMNS if format_type == 'old' else NEW_FORMAT_COLUMNS
+        col = {name: i for i, name in enumerate(columns)}
+        values = df.reindex(columns=columns).to_numpy(dtype=object)
+
+        for idx, row in zip(df.index, values):
             try:
                 # Split full name into first and last name
-                full_name = str(row["Full Name"]).strip()
+                full_name = str(row[col["Full Name"]]).strip()
                 name_parts = full_name.split(" ", 1)
                 first_name = name_parts[0] if name_parts else ""
                 last_name = name_parts[1] if len(name_parts) > 1 else ""
 
                 if format_type == 'old':
                     # Old format payload
-                    site_name = str(row["Site Name"]).strip() if "Site Name" in row and not pd_isna(row["Site Name"]) else None
+                    site_name = _cell_str(row[col["Site Name"]])
+                    base_salary = row[col["Base Salary"]]
                     payload = {
                         "first_name": first_name,
                         "last_name": last_name,
-                        "date_of_birth": pd_to_date(row["Date of Birth"]),
-                        "gender": str(row["Gender"]).strip() if not pd_isna(row["Gender"]) else None,
+                        "date_of_birth": pd_to_date(row[col["Date of Birth"]]),
+                        "gender": _cell_str(row[col["Gender"]]),
                         "site_name": site_name,
-                        "rank": str(row["Rank"]).strip() if "Rank" in row and not pd_isna(row["Rank"]) else None,
-                        "state": str(row["State"]).strip() if "State" in row and not pd_isna(row["State"]) else None,
-                        "base_salary": row["Base Salary"] if "Base Salary" in row and not pd_isna(row["Base Salary"]) else None,
+                        "rank": _cell_str(row[col["Rank"]]),
+                        "state": _cell_str(row[col["State"]]),
+                        "base_salary": base_salary if not pd_isna(base_salary) else None,
                     }
                     # Add site_id for employee record
                     if site_name:
                         payload["site_id"] = _get_site_id_from_name(site_name)
                 else:
                     # New format payload (comprehensive)
-                    work_location = str(row.get("Work Location")).strip() if row.get("Work Location") and not pd_isna(row["Work Location"]) else None
-                    
+                    work_location = _cell_text(row[col["Work Location"]])
+
                     payload = {
                         "first_name": first_name,
                         "last_name": last_name,
-                        "date_of_birth": pd_to_date(row.get("Date of Birth")),
-                        "gender": str(row.get("Gender")).strip() if row.get("Gender") and not pd_isna(row["Gender"]) else None,
-                        "marital_status": str(row.get("Marital Status")).strip() if row.get("Marital Status") and not pd_isna(row["Marital Status"]) else None,
-                        "nationality": str(row.get("Nationality")).strip() if row.get("Nationality") and not pd_isna(row["Nationality"]) else "Indian",
-                        "blood_group": str(row.get("Blood Group")).strip() if row.get("Blood Group") and not pd_isna(row["Blood Group"]) else None,
-                        "address": str(row.get("Permanent Address")).strip() if row.get("Permanent Address") and not pd_isna(row["Permanent Address"]) else None,
-                        "phone_number": str(row.get("Mobile Number")).strip() if row.get("Mobile Number") and not pd_isna(row["Mobile Number"]) else None,
-                        "alternate_contact_number": str(row.get("Alternate Contact Number")).strip() if row.get("Alternate Contact Number") and not pd_isna(row["Alternate Contact Number"]) else None,
-                        "adhar_number": str(row.get("Aadhaar Number")).strip() if row.get("Aadhaar Number") and not pd_isna(row["Aadhaar Number"]) else None,
-                        "pan_card_number": str(row.get("PAN Card Number")).strip() if row.get("PAN Card Number") and not pd_isna(row["PAN Card Number"]) else None,
-                        "voter_id_driving_license": str(row.get("Voter ID / Driving License")).strip() if row.get("Voter ID / Driving License") and not pd_isna(row["Voter ID / Driving License"]) else None,
-                        "uan": str(row.get("UAN")).strip() if row.get("UAN") and not pd_isna(row["UAN"]) else None,
-                        "esic_number": str(row.get("ESIC Number")).strip() if row.get("ESIC Number") and not pd_isna(row["ESIC Number"]) else None,
-                        "hire_date": pd_to_date(row.get("Date of Joining")),
-                        "employment_type": str(row.get("Employment Type")).strip() if row.get("Employment Type") and not pd_isna(row["Employment Type"]) else None,
-                        "department_id": str(row.get("Department")).strip() if row.get("Department") and not pd_isna(row["Department"]) else None,
-                        "designation": str(row.get("Designation")).strip() if row.get("Designation") and not pd_isna(row["Designation"]) else None,
+                        "date_of_birth": pd_to_date(row[col["Date of Birth"]]),
+                        "hire_date": pd_to_date(row[col["Date of Joining"]]),
                         "work_location": work_location,
-                        "reporting_manager": str(row.get("Reporting Manager")).strip() if row.get("Reporting Manager") and not pd_isna(row["Reporting Manager"]) else None,
-                        "skill_category": str(row.get("Skill Category")).strip() if row.get("Skill Category") and not pd_isna(row["Skill Category"]) else None,
-                        "salary_advance_loan": str(row.get("Salary Advance/Loan")).strip() if row.get("Salary Advance/Loan") and not pd_isna(row["Salary Advance/Loan"]) else None,
-                        "pf_applicability": _parse_bool(row.get("PF Applicability")),
-                        "esic_applicability": _parse_bool(row.get("ESIC Applicability")),
-                        "professional_tax_applicability": _parse_bool(row.get("Professional Tax Applicability")),
-                        "experience_duration": str(row.get("Experience Duration")).strip() if row.get("Experience Duration") and not pd_isna(row["Experience Duration"]) else None,
-                        "highest_qualification": str(row.get("Highest Qualification")).strip() if row.get("Highest Qualification") and not pd_isna(row["Highest Qualification"]) else None,
-                        "year_of_passing": str(row.get("Year of Passing")).strip() if row.get("Year of Passing") and not pd_isna(row["Year of Passing"]) else None,
-                        "additional_certifications": str(row.get("Additional Certifications")).strip() if row.get("Additional Certifications") and not pd_isna(row["Additional Certifications"]) else None,
-                        "emergency_contact_name": str(row.get("Emergency Contact Name")).strip() if row.get("Emergency Contact Name") and not pd_isna(row["Emergency Contact Name"]) else None,
-                        "emergency_contact_relationship": str(row.get("Emergency Relationship")).strip() if row.get("Emergency Relationship") and not pd_isna(row["Emergency Relationship"]) else None,
-                        "emergency_contact_phone": str(row.get("Emergency Phone Number")).strip() if row.get("Emergency Phone Number") and not pd_isna(row["Emergency Phone Number"]) else None,
-                        "salary_code": str(row.get("Salary Code")).strip() if row.get("Salary Code") and not pd_isna(row["Salary Code"]) else None,
-                        "bank_account_number": str(row.get("Bank Account Number")).strip() if row.get("Bank Account Number") and not pd_isna(row["Bank Account Number"]) else None,
-                        "bank_name": str(row.get("Bank Name")).strip() if row.get("Bank Name") and not pd_isna(row["Bank Name"]) else None,
-                        "ifsc_code": str(row.get("IFSC Code")).strip() if row.get("IFSC Code") and not pd_isna(row["IFSC Code"]) else None,
+                        "nationality": _cell_text(row[col["Nationality"]], "Indian"),
                     }
-                    
+                    for key, column in NEW_FORMAT_TEXT_FIELDS:
+                        payload[key] = _cell_text(row[col[column]])
+                    for key, column in NEW_FORMAT_BOOL_FIELDS:
+                        payload[key] = _parse_bool(row[col[column]])
+
                     # For new format, try to map work_location to site_id
                     if work_location:
                         site_name = _get_site_name_from_work_location(work_location)
@@ -301,16 +356,62 @@ def bulk_import_from_frames(sheet_frames: dict) -> dict:
                 if not payload["first_name"]:
                     raise ValueError("First Name is required")
 
-                # create
-                _ = create_employee(payload)
-                summary["inserted"] += 1
+                employee_values, account_values = _employee_values(payload)
+                pending.append((sheet, idx, employee_values, account_values))
             except Exception as e:
                 summary["errors"].append(
                     {"sheet": sheet, "row_index": int(idx), "error": str(e)}
                 )
 
+            if len(pending) >= BULK_IMPORT_BATCH_SIZE:
+                _insert_employee_batch(pending, summary)
+                pending = []
+
+    if pending:
+        _insert_employee_batch(pending, summary)
+
     return summary
 
+def _insert_employee_batch(batch, summary):
+    """
+    Insert a batch of (sheet, row_index, employee_values, account_values) rows
+    with one bulk INSERT per table, bypassing per-object ORM bookkeeping.
+    If the batch fails, rows are retried one by one so only bad rows are reported.
+    """
+    try:
+        with db.session.begin_nested():
+            _insert_employee_rows(batch)
+        summary["inserted"] += len(batch)
+    except Exception:
+        for entry in batch:
+            sheet, idx = entry[0], entry[1]
+            try:
+                with db.session.begin_nested():
+                    _insert_employee_rows([entry])
+                summary["inserted"] += 1
+            except Exception as e:
+                summary["errors"].append(
+                    {"sheet": sheet, "row_index": int(idx), "error": str(e)}
+                )
+
+    db.session.commit()
+
+def _insert_employee_rows(batch):
+    # A multi-row INSERT ... RETURNING rather than COPY: account rows need the
+    # sequence-generated employee IDs, and COPY cannot hand them back.
+    employee_ids = db.session.execute(
+        insert(Employee).returning(Employee.employee_id, sort_by_parameter_order=True),
+        [employee_values for _, _, employee_values, _ in batch]
+    ).scalars().all()
+
+    accounts = [
+        dict(account_values, emp_id=employee_id)
+        for (_, _, _, account_values), employee_id in zip(batch, employee_ids)
+        if account_values
+    ]
+    if accounts:
+        db.session.execute(insert(AccountDetails), accounts)
+
 # Helpers for date coercion without importing pandas here
 from datetime import datetime
 def pd_isna(v):
@@ -1,6 +1,7 @@
 import os
-import tempfile
+import re
 import logging
+from io import BytesIO
 from pathlib import Path
 from typing import Optional
 import platform
@@ -9,31 +10,64 @@ import platform
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_payroll_pdf(html_content: str, filename: str) -> str:
+# PDF backends are resolved once at import time. Python does not cache a failed
+# import, so probing inside generate_payroll_pdf repeated WeasyPrint's Pango/Cairo
+# library lookup on every payslip run whenever those system libraries are missing.
+try:
+    from weasyprint import HTML, CSS
+    from weasyprint.text.fonts import FontConfiguration
+    WEASYPRINT_IMPORT_ERROR = None
+except Exception as e:  # OSError when the system libraries are missing
+    WEASYPRINT_IMPORT_ERROR = e
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    REPORTLAB_IMPORT_ERROR = None
+except ImportError as e:
+    REPORTLAB_IMPORT_ERROR = e
+
+_reportlab_fonts_registered = False
+
+def _register_reportlab_fonts():
+    """Register system fonts with ReportLab once per process"""
+    global _reportlab_fonts_registered
+    if _reportlab_fonts_registered:
+        return
+    _reportlab_fonts_registered = True
+    try:
+        # Try to register system fonts
+        pdfmetrics.registerFont(TTFont('Arial', 'arial.ttf'))
+    except:
+        # Use built-in fonts as fallback
+        pass
+
+def generate_payroll_pdf(html_content: str) -> BytesIO:
     """
     Generate PDF from HTML content with enhanced server compatibility.
-    Returns path to generated PDF file.
+    The PDF is rendered in memory; nothing is written to disk.
     
     Args:
         html_content (str): HTML content with CSS styling
-        filename (str): Desired filename for the PDF
         
     Returns:
-        str: Path to generated PDF file
+        BytesIO: Buffer holding the PDF, positioned at the start
     
     Raises:
         ImportError: If no PDF generation library is available
     """
-    # Create temp directory for PDF
-    temp_dir = tempfile.mkdtemp()
-    temp_pdf_path = os.path.join(temp_dir, filename)
-
     try:
         # Try WeasyPrint first with server-specific configurations
         try:
-            from weasyprint import HTML, CSS
-            from weasyprint.text.fonts import FontConfiguration
-            
+            if WEASYPRINT_IMPORT_ERROR is not None:
+                # Fresh instance per call so tracebacks don't pile up on the cached one
+                raise type(WEASYPRINT_IMPORT_ERROR)(*WEASYPRINT_IMPORT_ERROR.args)
+
             logger.info("Attempting to generate PDF with WeasyPrint...")
             
             # Clean up HTML for better server compatibility
@@ -46,15 +80,17 @@ def generate_payroll_pdf(html_content: str, filename: str) -> str:
             html_doc = HTML(string=cleaned_html, base_url="")
             
             # Generate PDF with specific options for server environments
+            pdf_buffer = BytesIO()
             html_doc.write_pdf(
-                temp_pdf_path,
+                pdf_buffer,
                 font_config=font_config,
                 optimize_images=True,
                 pdf_version="1.4"  # Better compatibility
             )
             
-            logger.info(f"PDF generated successfully with WeasyPrint: {temp_pdf_path}")
-            return temp_pdf_path
+            logger.info(f"PDF generated successfully with WeasyPrint: {pdf_buffer.getbuffer().nbytes} bytes")
+            pdf_buffer.seek(0)
+            return pdf_buffer
             
         except ImportError as e:
             logger.warning(f"WeasyPrint not available: {e}")
@@ -66,28 +102,16 @@ def generate_payroll_pdf(html_content: str, filename: str) -> str:
         # Enhanced ReportLab fallback with better layout control
         try:
             logger.info("Falling back to ReportLab...")
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib import colors
-            from reportlab.lib.units import inch, mm
-            from reportlab.pdfbase import pdfmetrics
-            from reportlab.pdfbase.ttfonts import TTFont
-            import re
-            from bs4 import BeautifulSoup
-            
+            if REPORTLAB_IMPORT_ERROR is not None:
+                raise ImportError(*REPORTLAB_IMPORT_ERROR.args)
+
             # Register default fonts if available
-            try:
-                # Try to register system fonts
-                pdfmetrics.registerFont(TTFont('Arial', 'arial.ttf'))
-            except:
-                # Use built-in fonts as fallback
-                pass
+            _register_reportlab_fonts()
             
             # Create PDF with ReportLab using exact dimensions
+            pdf_buffer = BytesIO()
             doc = SimpleDocTemplate(
-                temp_pdf_path, 
+                pdf_buffer,
                 pagesize=A4,
                 leftMargin=8*mm,    # 0.3cm
                 rightMargin=8*mm,   # 0.3cm
@@ -159,8 +183,9 @@ def generate_payroll_pdf(html_content: str, filename: str) -> str:
             
             # Build PDF
             doc.build(story)
-            logger.info(f"PDF generated successfully with ReportLab: {temp_pdf_path}")
-            return temp_pdf_path
+            logger.info(f"PDF generated successfully with ReportLab: {pdf_buffer.getbuffer().nbytes} bytes")
+            pdf_buffer.seek(0)
+            return pdf_buffer
             
         except ImportError as e:
             logger.error(f"ReportLab not available: {e}")
@@ -176,14 +201,6 @@ def generate_payroll_pdf(html_content: str, filename: str) -> str:
             raise e
                 
     except Exception as e:
-        # Clean up on error
-        if os.path.exists(temp_pdf_path):
-            os.remove(temp_pdf_path)
-        if os.path.exists(temp_dir):
-            try:
-                os.rmdir(temp_dir)
-            except:
-                pass
         logger.error(f"PDF generation failed: {e}")
         raise e
 
@@ -238,11 +255,6 @@ def generate_enhanced_reportlab_story(html_content: str, styles, company_style,
     """
     Convert HTML content to ReportLab story with enhanced layout matching
     """
-    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak
-    from reportlab.lib import colors
-    from reportlab.lib.units import mm
-    import re
-    
     story = []
     
     # Parse HTML to extract payslip data
@@ -458,7 +470,9 @@ if __name__ == "__main__":
     """
     
     try:
-        pdf_path = generate_payroll_pdf(sample_html, "test_payslip.pdf")
-        print(f"PDF generated successfully at: {pdf_path}")
+        pdf_buffer = generate_payroll_pdf(sample_html)
+        with open("test_payslip.pdf", "wb") as fh:
+            fh.write(pdf_buffer.getbuffer())
+        print("PDF generated successfully at: test_payslip.pdf")
     except Exception as e:
         print(f"Error generating PDF: {str(e)}")
\ No newline at end of file
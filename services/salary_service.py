@@ -7,6 +7,7 @@ from models.deduction import Deduction
 from datetime import datetime, date
 from sqlalchemy import and_, func, case
 import pandas as pd
+import numpy as np
 import calendar
 
 class SalaryService:
@@ -75,21 +76,23 @@ class SalaryService:
         Returns (total_deduction, deduction_details_dict)
         """
         try:
-            deductions = Deduction.query.filter_by(employee_id=employee_id).all()
+            deductions = Deduction.query.filter(
+                Deduction.employee_id == employee_id,
+                Deduction.active_for_month_filter(year, month)
+            ).all()
             
             total_deduction = 0
             deduction_details = {}
             
             for deduction in deductions:
-                if deduction.is_active_for_month(year, month):
-                    installment = deduction.get_installment_for_month(year, month)
-                    total_deduction += installment
+                installment = deduction.get_installment_for_month(year, month)
+                total_deduction += installment
                     
-                    deduction_type = deduction.deduction_type
-                    if deduction_type in deduction_details:
-                        deduction_details[deduction_type] += installment
-                    else:
-                        deduction_details[deduction_type] = installment
+                deduction_type = deduction.deduction_type
+                if deduction_type in deduction_details:
+                    deduction_details[deduction_type] += installment
+                else:
+                    deduction_details[deduction_type] = installment
             
             return float(total_deduction or 0), deduction_details
             
@@ -187,17 +190,17 @@ class SalaryService:
             # STEP 3: Bulk fetch ALL deductions in ONE query
             # ============================================
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # ============================================
             # STEP 4: Calculate salary for all employees (in-memory)
@@ -416,17 +419,17 @@ class SalaryService:
             # STEP 3: Bulk fetch ALL deductions in ONE query
             # ============================================
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
             
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
             
             # ============================================
             # STEP 4: Calculate salary for all employees (in-memory)
@@ -548,17 +551,19 @@ class SalaryService:
             weekdays = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             attendance_cols = [col for col in df.columns if any(day in col for day in weekdays)]
 
-            def calculate(row):
-                days_present = sum(str(row[col]).strip().upper() == 'P' for col in attendance_cols)
-                employee_id = str(row['Employee ID']).strip()
-                daily_wage = SalaryService.get_employee_daily_wage(employee_id)
-
-                basic = days_present * daily_wage
-                pf = 0.12 * min(basic, 15000)
-                esic = 0.0075 * min(basic, 21000)
-                return pd.Series([days_present, daily_wage, basic, pf, esic])
+            # Present days, wages and statutory deductions for all rows at once
+            employee_ids = pd.to_numeric(df['Employee ID'].astype(str).str.strip(), errors='coerce')
+            valid_ids = [int(emp_id) for emp_id in employee_ids.dropna().unique()]
 
-            df[['Present Days', 'Daily Wage', 'Basic', 'PF', 'ESIC']] = df.apply(calculate, axis=1)
+            # Normalise each distinct mark once, then count through the codes
+            cells = df[attendance_cols].to_numpy(dtype=str)
+            marks, codes = np.unique(cells, return_inverse=True)
+            is_present = np.char.upper(np.char.strip(marks)) == 'P'
+            df['Present Days'] = is_present[codes].reshape(cells.shape).sum(axis=1)
+            df['Daily Wage'] = employee_ids.map(SalaryService.get_bulk_daily_wages(valid_ids)).fillna(526.0)
+            df['Basic'] = df['Present Days'] * df['Daily Wage']
+            df['PF'] = 0.12 * np.minimum(df['Basic'], 15000)
+            df['ESIC'] = 0.0075 * np.minimum(df['Basic'], 21000)
 
             if not adj.empty:
                 df = pd.merge(df, adj, on='Employee ID', how='left')
@@ -572,38 +577,22 @@ class SalaryService:
                 if col not in df.columns:
                     df[col] = 0
 
+            current_date = datetime.now()
+            year = current_date.year
+            month = current_date.month
+
+            # Overtime for all rows at once: one grouped query, then column arithmetic
+            # (IDs re-read because the adjustments merge may have re-indexed df)
+            employee_ids = pd.to_numeric(df['Employee ID'].astype(str).str.strip(), errors='coerce')
+            overtime_by_employee = SalaryService.get_bulk_overtime_shifts(valid_ids, year, month)
+            df['Overtime Shifts'] = employee_ids.map(overtime_by_employee).fillna(0.0)
+            df['Overtime Hours'] = df['Overtime Shifts'] * 8
+            df['Overtime Rate Hourly'] = df['Daily Wage'] / 8
+            df['Overtime Allowance'] = df['Overtime Hours'] * df['Overtime Rate Hourly']
+
             for index, row in df.iterrows():
                 employee_id = str(row['Employee ID']).strip()
-                
-                current_date = datetime.now()
-                year = current_date.year
-                month = current_date.month
-                
-                employee = Employee.query.filter_by(employee_id=employee_id).first()
-                
-                from services.attendance_service import AttendanceService
-                attendance_summary = AttendanceService.get_monthly_attendance_summary(
-                    employee_id, year, month
-                )
-                
-                if attendance_summary['success']:
-                    summary_data = attendance_summary['data']
-                    total_overtime_shifts = summary_data.get('total_overtime_shifts', 0)
-                    total_overtime_hours = total_overtime_shifts * 8
-                    
-                    if employee and hasattr(employee, 'overtime_rate_hourly') and employee.overtime_rate_hourly:
-                        overtime_rate_hourly = employee.overtime_rate_hourly
-                    else:
-                        daily_wage = row['Daily Wage']
-                        overtime_rate_hourly = daily_wage / 8
-                    
-                    overtime_allowance = total_overtime_hours * overtime_rate_hourly
-                    
-                    df.at[index, 'Overtime Allowance'] = overtime_allowance
-                    df.at[index, 'Overtime Shifts'] = total_overtime_shifts
-                    df.at[index, 'Overtime Hours'] = total_overtime_hours
-                    df.at[index, 'Overtime Rate Hourly'] = overtime_rate_hourly
-                
+
                 monthly_deduction_total, deduction_details = SalaryService.get_monthly_deductions(employee_id, year, month)
                 
                 for deduction_type, amount in deduction_details.items():
@@ -616,9 +605,6 @@ class SalaryService:
             
             for index, row in df.iterrows():
                 employee_id = str(row['Employee ID']).strip()
-                current_date = datetime.now()
-                year = current_date.year
-                month = current_date.month
                 
                 monthly_deduction_total, _ = SalaryService.get_monthly_deductions(employee_id, year, month)
                 df.at[index, 'Total Deductions'] += monthly_deduction_total
@@ -754,9 +740,71 @@ class SalaryService:
             }
 
     @staticmethod
-    def calculate_overtime_allowance(employee_id, year, month):
+    def get_bulk_daily_wages(employee_ids):
+        """
+        OPTIMIZED: Resolve daily wages for multiple employees in ONE query
+        Uses the same precedence as get_employee_daily_wage
+        Returns dict: {employee_id: daily_wage}
+        """
+        if not employee_ids:
+            return {}
+
+        rows = db.session.query(
+            Employee.employee_id,
+            Employee.skill_category,
+            Employee.wage_rate,
+            WageMaster.base_wage.label('wage_master_base_wage')
+        ).outerjoin(
+            WageMaster, Employee.salary_code == WageMaster.salary_code
+        ).filter(
+            Employee.employee_id.in_(employee_ids)
+        ).all()
+
+        daily_wages = {}
+        for emp in rows:
+            if emp.wage_master_base_wage:
+                daily_wages[emp.employee_id] = emp.wage_master_base_wage
+            elif emp.wage_rate:
+                daily_wages[emp.employee_id] = emp.wage_rate
+            else:
+                skill_level = emp.skill_category or 'Un-Skilled'
+                daily_wages[emp.employee_id] = SalaryService.wage_map.get(skill_level, 526.0)
+
+        return daily_wages
+
+    @staticmethod
+    def get_bulk_overtime_shifts(employee_ids, year, month):
+        """
+        OPTIMIZED: Sum overtime shifts for multiple employees in ONE grouped query
+        Returns dict: {employee_id: total_overtime_shifts}
+        """
+        if not employee_ids:
+            return {}
+
+        first_day = date(year, month, 1)
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+
+        rows = db.session.query(
+            Attendance.employee_id,
+            func.sum(Attendance.overtime_shifts).label('total_overtime_shifts')
+        ).filter(
+            Attendance.employee_id.in_(employee_ids),
+            Attendance.attendance_date >= first_day,
+            Attendance.attendance_date <= last_day
+        ).group_by(Attendance.employee_id).all()
+
+        overtime_shifts = {emp_id: 0.0 for emp_id in employee_ids}
+        for row in rows:
+            overtime_shifts[row.employee_id] = float(row.total_overtime_shifts or 0.0)
+
+        return overtime_shifts
+
+    @staticmethod
+    def calculate_overtime_allowance(employee_id, year, month, daily_wage=None, overtime_shifts=None):
         """
         Calculate overtime allowance for an employee using overtime shifts
+        Pass daily_wage (e.g. from get_bulk_daily_wages) to skip the per-employee wage lookup
+        Pass overtime_shifts (e.g. from get_bulk_overtime_shifts) to skip the attendance summary
         Returns: (overtime_allowance, overtime_shifts, overtime_hours, overtime_rate_hourly)
         """
         try:
@@ -764,22 +812,26 @@ class SalaryService:
             if not employee:
                 return 0.0, 0.0, 0.0, 0.0
 
-            from services.attendance_service import AttendanceService
-            attendance_summary = AttendanceService.get_monthly_attendance_summary(
-                employee_id, year, month
-            )
+            if overtime_shifts is not None:
+                total_overtime_shifts = overtime_shifts
+            else:
+                from services.attendance_service import AttendanceService
+                attendance_summary = AttendanceService.get_monthly_attendance_summary(
+                    employee_id, year, month
+                )
 
-            if not attendance_summary['success']:
-                return 0.0, 0.0, 0.0, 0.0
+                if not attendance_summary['success']:
+                    return 0.0, 0.0, 0.0, 0.0
 
-            summary_data = attendance_summary['data']
-            total_overtime_shifts = summary_data.get('total_overtime_shifts', 0)
+                summary_data = attendance_summary['data']
+                total_overtime_shifts = summary_data.get('total_overtime_shifts', 0)
             total_overtime_hours = total_overtime_shifts * 8
 
             if hasattr(employee, 'overtime_rate_hourly') and employee.overtime_rate_hourly:
                 overtime_rate_hourly = employee.overtime_rate_hourly
             else:
-                daily_wage = SalaryService.get_employee_daily_wage(employee_id)
+                if daily_wage is None:
+                    daily_wage = SalaryService.get_employee_daily_wage(employee_id)
                 overtime_rate_hourly = daily_wage / 8
 
             overtime_allowance = total_overtime_hours * overtime_rate_hourly
@@ -894,17 +946,17 @@ class SalaryService:
 
             # STEP 3: Bulk fetch deductions (1 query)
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # STEP 4: Calculate salaries in memory
             salary_data_dict = {}
@@ -1083,17 +1135,17 @@ class SalaryService:
 
             # STEP 3: Bulk fetch deductions (1 query)
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # STEP 4: Calculate salaries in memory (same as monthly calculation)
             salary_data_dict = {}
@@ -1206,17 +1258,17 @@ class SalaryService:
         try:
             # Single query to get ALL deductions for ALL employees
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # Calculate totals for each employee
             deductions_dict = {}
@@ -1392,17 +1444,17 @@ class SalaryService:
             # STEP 3: Bulk fetch ALL deductions in ONE query
             # ============================================
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # ============================================
             # STEP 4: Calculate SSPL salary for all employees (in-memory)
@@ -1588,14 +1640,14 @@ class SalaryService:
 
             # STEP 3: Bulk deductions
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    deductions_by_employee.setdefault(emp_id, []).append(deduction)
+                emp_id = deduction.employee_id
+                deductions_by_employee.setdefault(emp_id, []).append(deduction)
 
             # STEP 4: Calculate SSPL rows
             data_rows = []
@@ -1736,12 +1788,12 @@ class SalaryService:
 
             # STEP 3: Deductions
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
             deductions_by_employee = {}
             for d in all_deductions:
-                if d.is_active_for_month(year, month):
-                    deductions_by_employee.setdefault(d.employee_id, []).append(d)
+                deductions_by_employee.setdefault(d.employee_id, []).append(d)
 
             # STEP 4: Calculate
             salary_data_dict = {}
@@ -1808,17 +1860,17 @@ class SalaryService:
             # STEP 3: Bulk fetch ALL deductions in ONE query
             # ============================================
             all_deductions = Deduction.query.filter(
-                Deduction.employee_id.in_(employee_ids)
+                Deduction.employee_id.in_(employee_ids),
+                Deduction.active_for_month_filter(year, month)
             ).all()
 
             # Group deductions by employee
             deductions_by_employee = {}
             for deduction in all_deductions:
-                if deduction.is_active_for_month(year, month):
-                    emp_id = deduction.employee_id
-                    if emp_id not in deductions_by_employee:
-                        deductions_by_employee[emp_id] = []
-                    deductions_by_employee[emp_id].append(deduction)
+                emp_id = deduction.employee_id
+                if emp_id not in deductions_by_employee:
+                    deductions_by_employee[emp_id] = []
+                deductions_by_employee[emp_id].append(deduction)
 
             # ============================================
             # STEP 4: Calculate SSPL salary for all employees (in-memory)
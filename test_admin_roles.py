@@ -11,19 +11,56 @@ Requires: requests library (pip install requests)
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, Optional
+import logging
+import os
+from typing import Dict, Optional, Union
 import sys
 
 # Configuration
 BASE_URL = "http://localhost:5000/api"
 HEADERS = {"Content-Type": "application/json"}
 
+# (connect, read) timeout per request
+REQUEST_TIMEOUT = (1, 3)
+
+# Posted three times (once per role); encoded once and sent as-is. The
+# session's default Content-Type already marks it as JSON.
+TEST_SALARY_CODE_BODY = json.dumps({
+    "salary_code": "TEST001",
+    "site_name": "Test Site",
+    "basic_pay": 10000
+}).encode("utf-8")
+
+# One keep-alive session for the whole run so every check reuses the same
+# connection to the local server instead of opening a new one per request.
+# Connection errors and gateway responses while the server is still starting
+# are retried with a short backoff rather than failing the check outright.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        raise_on_status=False,
+    ),
+))
+
 # Test user credentials (update these based on your database)
 SUPERADMIN_CREDS = {"identifier": "superadmin@company.com", "password": "superadmin123"}
 ADMIN1_CREDS = {"identifier": "admin@company.com", "password": "admin123"}  # Update after creating user
 ADMIN2_CREDS = {"identifier": "admin2_user", "password": "password123"}  # Update after creating user
 
+# Per-check results are logged at DEBUG; set TEST_LOG=DEBUG to see them.
+logging.basicConfig(level=os.environ.get("TEST_LOG", "INFO"), format="%(message)s")
+log = logging.getLogger(__name__)
+
 # Color codes for terminal output
 GREEN = '\033[92m'
 RED = '\033[91m'
@@ -39,72 +76,77 @@ class APITester:
             "errors": []
         }
         self.tokens = {}
+        self.auth_headers = {}
     
-    def log_success(self, message: str):
-        print(f"{GREEN}✓{RESET} {message}")
+    def log_success(self, message: str, *args):
+        log.debug("%s✓%s " + message, GREEN, RESET, *args)
         self.results["passed"] += 1
     
     def log_failure(self, message: str, details: str = ""):
-        print(f"{RED}✗{RESET} {message}")
+        log.error("%s✗%s %s", RED, RESET, message)
         if details:
-            print(f"  {YELLOW}Details: {details}{RESET}")
+            log.error("  %sDetails: %s%s", YELLOW, details, RESET)
         self.results["failed"] += 1
         self.results["errors"].append(f"{message}: {details}")
     
-    def log_info(self, message: str):
-        print(f"{BLUE}ℹ{RESET} {message}")
+    def log_info(self, message: str, *args):
+        log.debug("%sℹ%s " + message, BLUE, RESET, *args)
     
     def login(self, credentials: Dict, role_name: str) -> Optional[str]:
         """Login and return token"""
-        self.log_info(f"Logging in as {role_name}...")
+        self.log_info("Logging in as %s...", role_name)
         try:
-            response = requests.post(
+            response = SESSION.post(
                 f"{BASE_URL}/login",
                 json=credentials,
-                headers=HEADERS
+                timeout=REQUEST_TIMEOUT
             )
             if response.status_code == 200:
                 data = response.json()
                 token = data.get("token")
                 if token:
                     self.tokens[role_name] = token
-                    self.log_success(f"Logged in as {role_name}")
+                    # Built once per role; merged over SESSION.headers on each request
+                    self.auth_headers[role_name] = {"Authorization": f"Bearer {token}"}
+                    self.log_success("Logged in as %s", role_name)
                     return token
                 else:
                     self.log_failure(f"Login as {role_name} - no token in response")
             else:
                 self.log_failure(f"Login as {role_name}", f"Status: {response.status_code}, Response: {response.text}")
-        except Exception as e:
+        except requests.RequestException as e:
+            # Transient failures were already retried by the session adapter
             self.log_failure(f"Login as {role_name}", str(e))
         return None
     
     def test_endpoint(self, role: str, method: str, endpoint: str, 
                      expected_status: int, description: str, 
-                     payload: Optional[Dict] = None) -> bool:
-        """Test a single endpoint"""
+                     payload: Optional[Union[Dict, bytes]] = None) -> bool:
+        """Test a single endpoint (payload may be a dict or pre-encoded JSON)"""
         token = self.tokens.get(role)
         if not token:
             self.log_failure(f"{description} ({role})", "No auth token")
             return False
         
-        headers = {**HEADERS, "Authorization": f"Bearer {token}"}
+        headers = self.auth_headers[role]
         url = f"{BASE_URL}{endpoint}"
+        body = {"data": payload} if isinstance(payload, bytes) else {"json": payload}
         
         try:
             if method == "GET":
-                response = requests.get(url, headers=headers)
+                response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
             elif method == "POST":
-                response = requests.post(url, json=payload, headers=headers)
+                response = SESSION.post(url, headers=headers, timeout=REQUEST_TIMEOUT, **body)
             elif method == "PUT":
-                response = requests.put(url, json=payload, headers=headers)
+                response = SESSION.put(url, headers=headers, timeout=REQUEST_TIMEOUT, **body)
             elif method == "DELETE":
-                response = requests.delete(url, headers=headers)
+                response = SESSION.delete(url, headers=headers, timeout=REQUEST_TIMEOUT)
             else:
                 self.log_failure(description, f"Unknown method: {method}")
                 return False
             
             if response.status_code == expected_status:
-                self.log_success(f"{description} ({role}): {method} {endpoint} → {response.status_code}")
+                self.log_success("%s (%s): %s %s → %s", description, role, method, endpoint, response.status_code)
                 return True
             else:
                 self.log_failure(
@@ -112,7 +154,7 @@ class APITester:
                     f"Expected {expected_status}, got {response.status_code}. Response: {response.text[:200]}"
                 )
                 return False
-        except Exception as e:
+        except requests.RequestException as e:
             self.log_failure(f"{description} ({role})", str(e))
             return False
 
@@ -120,99 +162,94 @@ class APITester:
 def main():
     tester = APITester()
     
-    print(f"\n{BLUE}{'='*60}{RESET}")
-    print(f"{BLUE}Admin Role Split - Comprehensive API Test Suite{RESET}")
-    print(f"{BLUE}{'='*60}{RESET}\n")
+    log.info("\n%s%s%s", BLUE, "=" * 60, RESET)
+    log.info("%sAdmin Role Split - Comprehensive API Test Suite%s", BLUE, RESET)
+    log.info("%s%s%s\n", BLUE, "=" * 60, RESET)
     
     # Phase 1: Authentication
-    print(f"\n{BLUE}Phase 1: Authentication Tests{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 1: Authentication Tests%s", BLUE, RESET)
+    log.info("-" * 60)
     superadmin_token = tester.login(SUPERADMIN_CREDS, "superadmin")
     admin1_token = tester.login(ADMIN1_CREDS, "admin1")
     admin2_token = tester.login(ADMIN2_CREDS, "admin2")
     
     if not all([superadmin_token, admin1_token, admin2_token]):
-        print(f"\n{RED}CRITICAL: Could not log in all users. Please update credentials in script.{RESET}")
-        print(f"{YELLOW}To create test users, run these SQL commands:{RESET}")
-        print("\nUPDATE users SET role = 'admin1' WHERE email = 'your-admin1@example.com';")
-        print("UPDATE users SET role = 'admin2' WHERE email = 'your-admin2@example.com';")
-        print(f"\n{YELLOW}Then update the credentials in this script.{RESET}\n")
+        log.critical("\n%sCRITICAL: Could not log in all users. Please update credentials in script.%s", RED, RESET)
+        log.critical("%sTo create test users, run these SQL commands:%s", YELLOW, RESET)
+        log.critical("\nUPDATE users SET role = 'admin1' WHERE email = 'your-admin1@example.com';")
+        log.critical("UPDATE users SET role = 'admin2' WHERE email = 'your-admin2@example.com';")
+        log.critical("\n%sThen update the credentials in this script.%s\n", YELLOW, RESET)
         sys.exit(1)
     
     # Phase 2: Salary Codes Tests (Critical for role differentiation)
-    print(f"\n{BLUE}Phase 2: Salary Codes Access Control{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 2: Salary Codes Access Control%s", BLUE, RESET)
+    log.info("-" * 60)
     
     # GET (Read) - All admin roles should succeed
     tester.test_endpoint("admin1", "GET", "/salary-codes", 200, "List salary codes")
     tester.test_endpoint("admin2", "GET", "/salary-codes", 200, "List salary codes")
     
     # POST (Create) - Only admin1 and superadmin should succeed, admin2 should fail
-    test_salary_code = {
-        "salary_code": "TEST001",
-        "site_name": "Test Site",
-        "basic_pay": 10000
-    }
-    tester.test_endpoint("superadmin", "POST", "/salary-codes", 201, "Create salary code", test_salary_code)
-    tester.test_endpoint("admin1", "POST", "/salary-codes/create", 201, "Create salary code", test_salary_code)
-    tester.test_endpoint("admin2", "POST", "/salary-codes/create", 403, "Create salary code (should FAIL)", test_salary_code)
+    tester.test_endpoint("superadmin", "POST", "/salary-codes", 201, "Create salary code", TEST_SALARY_CODE_BODY)
+    tester.test_endpoint("admin1", "POST", "/salary-codes/create", 201, "Create salary code", TEST_SALARY_CODE_BODY)
+    tester.test_endpoint("admin2", "POST", "/salary-codes/create", 403, "Create salary code (should FAIL)", TEST_SALARY_CODE_BODY)
     
     # Phase 3: Sites Management Tests
-    print(f"\n{BLUE}Phase 3: Sites Management{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 3: Sites Management%s", BLUE, RESET)
+    log.info("-" * 60)
     
     tester.test_endpoint("admin1", "GET", "/sites?page=1&per_page=10", 200, "List sites")
     tester.test_endpoint("admin2", "GET", "/sites?page=1&per_page=10", 200, "List sites")
     
     # Phase 4: Employee Management Tests
-    print(f"\n{BLUE}Phase 4: Employee Management{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 4: Employee Management%s", BLUE, RESET)
+    log.info("-" * 60)
     
     tester.test_endpoint("admin1", "GET", "/employees?page=1&per_page=10", 200, "List employees")
     tester.test_endpoint("admin2", "GET", "/employees?page=1&per_page=10", 200, "List employees")
     
     # Phase 5: Attendance Tests
-    print(f"\n{BLUE}Phase 5: Attendance Management{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 5: Attendance Management%s", BLUE, RESET)
+    log.info("-" * 60)
     
     tester.test_endpoint("admin1", "GET", "/attendance?page=1&per_page=10", 200, "List attendance")
     tester.test_endpoint("admin2", "GET", "/attendance?page=1&per_page=10", 200, "List attendance")
     
     # Phase 6: Payroll Tests
-    print(f"\n{BLUE}Phase 6: Payroll Access{RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 6: Payroll Access%s", BLUE, RESET)
+    log.info("-" * 60)
     
     tester.test_endpoint("admin1", "GET", "/payroll", 200, "Access payroll")
     tester.test_endpoint("admin2", "GET", "/payroll", 200, "Access payroll")
     
     # Phase 7: User Management (Superadmin only)
-    print(f"\n{BLUE}Phase 7: User Management (Superadmin Only){RESET}")
-    print("-" * 60)
+    log.info("\n%sPhase 7: User Management (Superadmin Only)%s", BLUE, RESET)
+    log.info("-" * 60)
     
     tester.test_endpoint("superadmin", "GET", "/superadmin/users", 200, "List users")
     tester.test_endpoint("admin1", "GET", "/superadmin/users", 403, "List users (should FAIL)")
     tester.test_endpoint("admin2", "GET", "/superadmin/users", 403, "List users (should FAIL)")
     
     # Final Summary
-    print(f"\n{BLUE}{'='*60}{RESET}")
-    print(f"{BLUE}Test Summary{RESET}")
-    print(f"{BLUE}{'='*60}{RESET}")
-    print(f"{GREEN}Passed:{RESET} {tester.results['passed']}")
-    print(f"{RED}Failed:{RESET} {tester.results['failed']}")
+    log.info("\n%s%s%s", BLUE, "=" * 60, RESET)
+    log.info("%sTest Summary%s", BLUE, RESET)
+    log.info("%s%s%s", BLUE, "=" * 60, RESET)
+    log.info("%sPassed:%s %s", GREEN, RESET, tester.results['passed'])
+    log.info("%sFailed:%s %s", RED, RESET, tester.results['failed'])
     
     if tester.results['failed'] > 0:
-        print(f"\n{RED}Failed Tests:{RESET}")
+        log.error("\n%sFailed Tests:%s", RED, RESET)
         for error in tester.results['errors']:
-            print(f"  • {error}")
+            log.error("  • %s", error)
     
     success_rate = (tester.results['passed'] / (tester.results['passed'] + tester.results['failed'])) * 100
-    print(f"\n{BLUE}Success Rate:{RESET} {success_rate:.1f}%")
+    log.info("\n%sSuccess Rate:%s %.1f%%", BLUE, RESET, success_rate)
     
     if tester.results['failed'] == 0:
-        print(f"\n{GREEN}All tests passed! ✓{RESET}\n")
+        log.info("\n%sAll tests passed! ✓%s\n", GREEN, RESET)
         sys.exit(0)
     else:
-        print(f"\n{RED}Some tests failed. Please review the errors above.{RESET}\n")
+        log.error("\n%sSome tests failed. Please review the errors above.%s\n", RED, RESET)
         sys.exit(1)
 
 
@@ -220,8 +257,10 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print(f"\n\n{YELLOW}Tests interrupted by user.{RESET}\n")
+        log.warning("\n\n%sTests interrupted by user.%s\n", YELLOW, RESET)
         sys.exit(1)
     except Exception as e:
-        print(f"\n{RED}Fatal error: {str(e)}{RESET}\n")
+        log.critical("\n%sFatal error: %s%s\n", RED, e, RESET)
         sys.exit(1)
+    finally:
+        SESSION.close()
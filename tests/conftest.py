@@ -6,12 +6,20 @@ This file sets up a clean environment for every test run:
 2. It uses an in-memory SQLite database for speed and isolation.
 3. It seeds a default admin user for authentication tests.
 4. it provides helper fixtures for employee creation and auth headers.
+
+The app and schema are built once per session. Each test that uses the `db`
+fixture runs inside an outer transaction that is rolled back afterwards, so
+commits made by tests and routes only release savepoints and never leak
+into the next test.
 """
 import os
+import itertools
 import pytest
 import jwt
 from unittest.mock import patch
 from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 # 1. Environment Overrides (Must happen before any app-related imports)
 os.environ["SECRET_KEY"] = "ci-test-secret-key-12345"
@@ -25,6 +33,17 @@ from models.employee import Employee
 from models.user import User
 from models.deduction import Deduction
 
+def _enable_sqlite_savepoints(engine):
+    """Let pysqlite honour explicit BEGIN/SAVEPOINT so per-test rollback works."""
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
 @pytest.fixture(scope="session")
 def app():
     # Patch the sequence sync because it uses Postgres-specific raw SQL
@@ -34,10 +53,17 @@ def app():
         test_app.config.update({
             "TESTING": True,
             "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-            "SQLALCHEMY_TRACK_MODIFICATIONS": False,
         })
 
         with test_app.app_context():
+            # Modification tracking and engine echo are fixed when the extension
+            # is initialised, so setting them here would be too late. Guard
+            # instead: either one adds per-attribute or per-statement overhead
+            # to every test that imports rows in bulk.
+            assert not test_app.config["SQLALCHEMY_TRACK_MODIFICATIONS"]
+            assert not _db.engine.echo
+
+            _enable_sqlite_savepoints(_db.engine)
             _db.create_all()
             # Seed our test admin
             if not User.query.filter_by(email="admin@test.com").first():
@@ -63,13 +89,28 @@ def client(app):
 
 @pytest.fixture()
 def db(app):
+    """Function-scoped database handle isolated by an outer rolled-back transaction."""
     with app.app_context():
-        yield _db
-        _db.session.rollback()
+        connection = _db.engine.connect()
+        transaction = connection.begin()
+        app_session = _db.session
+        # Flask-SQLAlchemy's own Session always resolves its engine, so bind a plain
+        # session to the test connection, scoped per app context like the default one.
+        _db.session = scoped_session(
+            sessionmaker(bind=connection, join_transaction_mode="create_savepoint"),
+            scopefunc=app_session.registry.scopefunc,
+        )
+        try:
+            yield _db
+        finally:
+            _db.session.remove()
+            _db.session = app_session
+            transaction.rollback()
+            connection.close()
 
-@pytest.fixture()
-def auth_headers(app):
-    """Generates a valid JWT for the test admin."""
+@pytest.fixture(scope="session")
+def admin_token(app):
+    """Issues one JWT for the test admin, shared by the whole session."""
     with app.app_context():
         user = User.query.filter_by(email="admin@test.com").first()
         payload = {
@@ -78,15 +119,22 @@ def auth_headers(app):
             'role': user.role,
             'exp': datetime.utcnow() + timedelta(hours=1)
         }
-        token = jwt.encode(payload, os.environ["SECRET_KEY"], algorithm='HS256')
-        return {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        return jwt.encode(payload, os.environ["SECRET_KEY"], algorithm='HS256')
+
+@pytest.fixture()
+def auth_headers(admin_token):
+    """Fresh headers carrying the cached admin JWT, so tests may modify them."""
+    return {
+        "Authorization": f"Bearer {admin_token}",
+        "Content-Type": "application/json"
+    }
+
+_employee_ids = itertools.count(100000)
+
 
 # Helper to create employees quickly in tests
 def make_employee(db_session, **kwargs):
-    emp_id = kwargs.pop('employee_id', 99999 + int(datetime.now().timestamp() % 10000))
+    emp_id = kwargs.pop('employee_id', None) or next(_employee_ids)
     defaults = {
         "employee_id": emp_id,
         "first_name": "Test",
@@ -0,0 +1,147 @@
+"""
+test_attendance_helpers.py — Tests for the attendance sheet header/value helpers.
+
+Verifies that:
+  - is_date accepts every supported header format and rejects non-date headers
+  - parse_date_from_column returns (year, month, day) for the same formats
+  - parse_date_columns maps every date header to its date and drops the rest
+  - is_attendance_upload_column keeps only the columns the upload reads
+  - normalize_attendance_value maps P/A/O variants to stored statuses
+  - normalize_attendance_series applies the same mapping to a whole column
+  - parse_overtime_column rounds a whole Overtime column the way round_to_half does
+  - build_attendance_copy_buffer renders insert mappings in COPY text format
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from utils.attendance_helpers import (
+    is_date, parse_date_from_column, parse_date_columns, is_attendance_upload_column, normalize_attendance_value, normalize_attendance_series, parse_overtime_column, round_to_half,
+    build_attendance_copy_buffer, ATTENDANCE_COPY_DEFAULTS,
+)
+
+
+DATE_HEADERS = [
+    ("2025-08-01 00:00:00", (2025, 8, 1)),
+    ("2025-08-01", (2025, 8, 1)),
+    ("01/08/2025", (2025, 8, 1)),
+    ("1-8-2025", (2025, 8, 1)),
+    ("1/8/25", (2025, 8, 1)),
+    ("31-12-99", (1999, 12, 31)),
+    (" 05/09/2025 ", (2025, 9, 5)),
+    (pd.Timestamp("2025-08-15"), (2025, 8, 15)),
+    (datetime(2025, 8, 16), (2025, 8, 16)),
+]
+
+NON_DATE_HEADERS = [
+    "Employee ID", "Employee Name", "Skill Level", "Name", "nan", "", None,
+    float("nan"), "32/01/2025", "2025-13-01", "2025-02-30", "1/1/1", "12345", "2025-08-01T00:00",
+    45870, 20250801.0, np.int64(1082025), True,
+]
+
+
+class TestIsDate:
+
+    @pytest.mark.parametrize("header,expected", DATE_HEADERS)
+    def test_accepts_date_headers(self, header, expected):
+        assert is_date(header) is True
+
+    @pytest.mark.parametrize("header", NON_DATE_HEADERS)
+    def test_rejects_non_date_headers(self, header):
+        assert is_date(header) is False
+
+    def test_repeated_header_reuses_cached_result(self):
+        is_date("15/08/2025")
+        hits = is_date.cache_info().hits
+        assert is_date("15/08/2025") is True
+        assert is_date.cache_info().hits == hits + 1
+
+
+class TestParseDateFromColumn:
+
+    @pytest.mark.parametrize("header,expected", DATE_HEADERS)
+    def test_parses_date_headers(self, header, expected):
+        assert parse_date_from_column(header) == expected
+
+    @pytest.mark.parametrize("header", NON_DATE_HEADERS)
+    def test_non_date_headers_return_none(self, header):
+        assert parse_date_from_column(header) == (None, None, None)
+
+    def test_parse_date_columns_maps_headers_once(self):
+        headers = [header for header, _ in DATE_HEADERS] + NON_DATE_HEADERS[:5]
+
+        dates = parse_date_columns(headers)
+
+        assert list(dates) == [header for header, _ in DATE_HEADERS]
+        assert list(dates.values()) == [date(*expected) for _, expected in DATE_HEADERS]
+
+
+class TestIsAttendanceUploadColumn:
+
+    @pytest.mark.parametrize("header", [
+        "Employee ID", "Emp_ID", " Employee Name ", "Name", "Skill Level", "Overtime",
+        "01/08/2025", datetime(2025, 8, 2),
+    ])
+    def test_keeps_columns_the_upload_reads(self, header):
+        assert is_attendance_upload_column(header) is True
+
+    @pytest.mark.parametrize("header", ["Designation", "Remarks", "Unnamed: 3", 42])
+    def test_drops_other_columns(self, header):
+        assert is_attendance_upload_column(header) is False
+
+
+class TestNormalizeAttendanceValue:
+
+    @pytest.mark.parametrize("value,expected", [
+        ("P", "Present"), (" p ", "Present"), ("Present", "Present"), ("PRESENT", "Present"),
+        ("A", "Absent"), ("absent", "Absent"),
+        ("O", "OFF"), ("off", "OFF"), ("Off", "OFF"),
+        ("X", None), ("", None), (None, None), (float("nan"), None),
+    ])
+    def test_maps_status_variants(self, value, expected):
+        assert normalize_attendance_value(value) == expected
+
+    def test_series_matches_per_value_mapping(self):
+        values = ["P", " p ", "Present", "absent", "O", "Off", "X", "", None, float("nan")]
+
+        result = normalize_attendance_series(pd.Series(values))
+
+        expected = [normalize_attendance_value(v) for v in values]
+        assert [None if pd.isna(r) else r for r in result] == expected
+
+
+class TestParseOvertimeColumn:
+
+    def test_matches_scalar_rounding(self):
+        values = [0, 0.25, 0.5, 0.75, 1.3, 1.5, 2, 2.5, 3.5, -1]
+        parsed = parse_overtime_column(pd.Series(values))
+        assert parsed.tolist() == [round_to_half(v) for v in values]
+
+    def test_blank_and_invalid_cells_become_zero(self):
+        parsed = parse_overtime_column(pd.Series([" 1.5 ", "", None, float("nan"), "abc", "inf"]))
+        assert parsed.tolist() == [1.5, 0.0, 0.0, 0.0, 0.0, 0.0]
+
+
+class TestBuildAttendanceCopyBuffer:
+
+    def test_renders_rows_in_copy_text_format(self):
+        records = [
+            {"attendance_id": "a1", "employee_id": 7, "attendance_date": date(2025, 8, 1),
+             "attendance_status": "Present", "remarks": "late\tbus\\stop\n", "approved_by": None},
+        ]
+
+        columns, buffer = build_attendance_copy_buffer(records)
+        row = dict(zip(columns, buffer.read().rstrip("\n").split("\t")))
+
+        assert columns[:6] == list(records[0])
+        assert row["attendance_date"] == "2025-08-01"
+        assert row["remarks"] == "late\\tbus\\\\stop\\n"
+        assert row["approved_by"] == "\\N"
+
+    def test_missing_columns_take_model_defaults(self):
+        columns, buffer = build_attendance_copy_buffer([{"attendance_id": "a1", "employee_id": 7}])
+        row = dict(zip(columns, buffer.read().rstrip("\n").split("\t")))
+
+        assert set(ATTENDANCE_COPY_DEFAULTS) <= set(columns)
+        assert row["overtime_shifts"] == "0.0"
+        assert row["is_approved"] == "True"
@@ -0,0 +1,140 @@
+"""
+test_attendance_upload.py — Tests for POST /attendance/bulk-mark-excel.
+
+Verifies that:
+  - Each date cell is stored with its normalized status (P/A/O in any case or spelling)
+  - Blank cells are stored as Absent rather than skipped
+  - Re-uploading a month (the parallel update path) overwrites the stored statuses
+  - Extra non-attendance columns in the sheet are ignored
+  - safe_bulk_insert streams chunks through COPY on PostgreSQL
+  - A failed chunk falls back to per-row inserts without undoing earlier chunks
+"""
+import io
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import pandas as pd
+import pytest
+from models.attendance import Attendance
+from routes.attendance import safe_bulk_insert
+from .conftest import make_employee
+
+pytestmark = pytest.mark.db
+
+
+def attendance_workbook(rows, extra_columns=()):
+    columns = ["Employee ID", "Employee Name", *extra_columns, "01/08/2025", "02/08/2025", "03/08/2025", "04/08/2025"]
+    buf = io.BytesIO()
+    pd.DataFrame(rows, columns=columns).to_excel(buf, index=False, engine="openpyxl")
+    buf.seek(0)
+    return buf
+
+
+def upload(client, auth_headers, buf):
+    return client.post(
+        "/api/attendance/bulk-mark-excel",
+        data={"file": (buf, "attendance.xlsx"), "month": "8", "year": "2025"},
+        headers={"Authorization": auth_headers["Authorization"]},
+        content_type="multipart/form-data",
+    )
+
+
+def stored_statuses(employee_id):
+    return {
+        a.attendance_date: a.attendance_status
+        for a in Attendance.query.filter_by(employee_id=employee_id)
+    }
+
+
+class TestBulkMarkExcel:
+
+    def test_cells_stored_with_normalized_status(self, client, auth_headers, db):
+        emp = make_employee(db, adhar_number="ATT00000001", phone_number="9700000001")
+        buf = attendance_workbook([[str(emp.employee_id), "Test User", " p ", "absent", None, "Off"]])
+
+        resp = upload(client, auth_headers, buf)
+
+        assert resp.status_code == 200, resp.get_json()
+        assert stored_statuses(emp.employee_id) == {
+            date(2025, 8, 1): "Present",
+            date(2025, 8, 2): "Absent",
+            date(2025, 8, 3): "Absent",
+            date(2025, 8, 4): "OFF",
+        }
+
+    def test_reupload_updates_existing_days(self, client, auth_headers, db):
+        emp = make_employee(db, adhar_number="ATT00000002", phone_number="9700000002")
+        row = [str(emp.employee_id), "Test User"]
+        assert upload(client, auth_headers, attendance_workbook([row + ["P", "P", "P", "P"]])).status_code == 200
+
+        resp = upload(client, auth_headers, attendance_workbook([row + ["A", None, "o", "Present"]]))
+
+        assert resp.status_code == 200, resp.get_json()
+        assert stored_statuses(emp.employee_id) == {
+            date(2025, 8, 1): "Absent",
+            date(2025, 8, 2): "Absent",
+            date(2025, 8, 3): "OFF",
+            date(2025, 8, 4): "Present",
+        }
+
+    def test_extra_columns_ignored(self, client, auth_headers, db):
+        emp = make_employee(db, adhar_number="ATT00000003", phone_number="9700000003")
+        buf = attendance_workbook(
+            [[str(emp.employee_id), "Test User", "Guard", "Gate 2", "P", "A", "P", "O"]],
+            extra_columns=("Designation", "Remarks"),
+        )
+
+        resp = upload(client, auth_headers, buf)
+
+        assert resp.status_code == 200, resp.get_json()
+        assert stored_statuses(emp.employee_id) == {
+            date(2025, 8, 1): "Present",
+            date(2025, 8, 2): "Absent",
+            date(2025, 8, 3): "OFF",
+            date(2025, 8, 4): "OFF",
+        }
+
+
+def attendance_record(employee_id, day, attendance_id=None):
+    return {
+        "attendance_id": attendance_id or str(uuid.uuid4()),
+        "employee_id": employee_id,
+        "attendance_date": date(2025, 8, day),
+        "attendance_status": "Present",
+        "overtime_shifts": 0.0,
+    }
+
+
+class TestSafeBulkInsert:
+
+    def test_postgresql_chunks_sent_through_copy(self, db):
+        records = [attendance_record(910001, day) for day in (1, 2, 3)]
+        postgres = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        connection = MagicMock()
+        cursor = connection.connection.cursor.return_value
+
+        with patch.object(db.session, "get_bind", return_value=postgres), \
+                patch.object(db.session, "connection", return_value=connection):
+            results = safe_bulk_insert(records, chunk_size=2)
+
+        assert results == {"successful": 3, "failed": 0, "errors": []}
+        assert cursor.copy_expert.call_count == 2
+        statement, buffer = cursor.copy_expert.call_args_list[0].args
+        columns = statement[len("COPY attendance ("):-len(") FROM STDIN")].split(", ")
+        assert statement.startswith("COPY attendance (") and statement.endswith(") FROM STDIN")
+        assert columns[:5] == ["attendance_id", "employee_id", "attendance_date", "attendance_status", "overtime_shifts"]
+        assert "is_approved" in columns
+        assert cursor.close.call_count == 2
+
+    def test_failed_chunk_does_not_undo_earlier_chunks(self, db):
+        emp = make_employee(db)
+        first = attendance_record(emp.employee_id, 1)
+        repeated = attendance_record(emp.employee_id, 3, attendance_id=first["attendance_id"])
+        records = [first, attendance_record(emp.employee_id, 2), repeated, attendance_record(emp.employee_id, 4)]
+
+        results = safe_bulk_insert(records, chunk_size=2)
+
+        assert results["successful"] == 3
+        assert results["failed"] == 1
+        assert sorted(stored_statuses(emp.employee_id)) == [date(2025, 8, d) for d in (1, 2, 4)]
@@ -0,0 +1,50 @@
+"""
+test_auth_required.py — Tests for token-protected endpoints.
+
+Verifies that:
+  - Supervisor and upload endpoints reject requests without a JWT with 401
+  - With the admin JWT each endpoint gets past auth and answers with its own status
+"""
+import pytest
+
+pytestmark = pytest.mark.db
+
+ATTENDANCE_BODY = {
+    "employee_id": "910001",
+    "attendance_date": "2024-08-24",
+    "attendance_status": "Present",
+}
+
+CASES = [
+    ("GET", "/api/employees/site_employees", {}),
+    ("POST", "/api/attendance/mark", {"json": ATTENDANCE_BODY}),
+    ("POST", "/api/attendance/bulk-mark-excel", {"data": {"month": "8", "year": "2024"}}),
+]
+
+# Same requests with the admin JWT: (status, message) each endpoint should answer with
+AUTHENTICATED_RESPONSES = [
+    (403, "Unauthorized"),           # site_employees is supervisor-only
+    (400, "Employee not found"),     # employee 910001 does not exist
+    (400, "No file uploaded"),       # the upload form carries no file
+]
+
+
+class TestAuthRequired:
+
+    @pytest.mark.parametrize("method, path, body", CASES)
+    def test_missing_token_rejected(self, client, method, path, body):
+        resp = client.open(path, method=method, **body)
+
+        assert resp.status_code == 401
+
+    @pytest.mark.parametrize(
+        "method, path, body, status, message",
+        [case + expected for case, expected in zip(CASES, AUTHENTICATED_RESPONSES)],
+    )
+    def test_admin_token_reaches_endpoint(self, client, auth_headers, db, method, path, body, status, message):
+        headers = {"Authorization": auth_headers["Authorization"]}
+
+        resp = client.open(path, method=method, headers=headers, **body)
+
+        assert resp.status_code == status
+        assert resp.get_json()["message"] == message
@@ -5,17 +5,24 @@ Verifies that:
   - GET /deductions/ hides deductions when the employee is soft-deleted
   - GET /deductions/ shows deductions again after the employee is reactivated
   - Deduction rows themselves are never removed during soft delete
+  - POST /deductions/bulk creates rows and reports unknown employees per row
 """
 import pytest
 from models.deduction import Deduction
 from models.employee import Employee
 from .conftest import make_employee
+import io
 import uuid
 from datetime import date
 
+pytestmark = pytest.mark.db
 
-def create_deduction(db_session, employee_id, deduction_type="Test Loan"):
-    """Helper: create and persist a deduction for an employee."""
+
+def create_deduction(db_session, employee_id, deduction_type="Test Loan", commit=True):
+    """Helper: create and persist a deduction for an employee.
+
+    Pass commit=False to stage several deductions and commit them together.
+    """
     ded = Deduction(
         deduction_id=str(uuid.uuid4()),
         employee_id=employee_id,
@@ -26,7 +33,8 @@ def create_deduction(db_session, employee_id, deduction_type="Test Loan"):
         created_by="test",
     )
     db_session.session.add(ded)
-    db_session.session.commit()
+    if commit:
+        db_session.session.commit()
     return ded
 
 
@@ -102,8 +110,9 @@ class TestDeductionContinuity:
             adhar_number="DED00000002",
             phone_number="9600000002",
         )
-        create_deduction(db, emp.employee_id, "Loan A")
-        create_deduction(db, emp.employee_id, "Loan B")
+        create_deduction(db, emp.employee_id, "Loan A", commit=False)
+        create_deduction(db, emp.employee_id, "Loan B", commit=False)
+        db.session.commit()
 
         count_before = Deduction.query.filter_by(employee_id=emp.employee_id).count()
         assert count_before == 2
@@ -126,3 +135,49 @@ class TestDeductionContinuity:
         count_after = Deduction.query.filter_by(employee_id=emp.employee_id).count()
         assert count_after == count_before, \
             "No deductions should be created or removed during the delete/reactivate cycle"
+
+
+class TestActiveForMonthFilter:
+    """The SQL active-month filter must agree with Deduction.is_active_for_month."""
+
+    def test_filter_matches_python_check(self, db):
+        emp = make_employee(db, adhar_number="DED00000003", phone_number="9600000003")
+        ded = create_deduction(db, emp.employee_id, "Window Loan", commit=False)
+        ded.months = 3
+        ded.paused_months = 1
+        ded.start_month = date(2025, 11, 15)
+        db.session.commit()
+
+        for year, month in [(2025, 10), (2025, 11), (2025, 12), (2026, 1), (2026, 2), (2026, 3)]:
+            in_sql = Deduction.query.filter(
+                Deduction.deduction_id == ded.deduction_id,
+                Deduction.active_for_month_filter(year, month),
+            ).count() == 1
+            assert in_sql == ded.is_active_for_month(year, month), (year, month)
+
+
+class TestBulkUpload:
+    """Bulk CSV upload creates one deduction per valid row."""
+
+    def test_bulk_csv_creates_deductions(self, client, auth_headers, db):
+        emp = make_employee(db, adhar_number="DED00000004", phone_number="9600000004")
+        csv = (
+            "Employee ID,Deduction Type,Total Amount,Months,Start Month\n"
+            f"{emp.employee_id}, Uniform ,3000,3,2025-04-01\n"
+            "99999999,Loan,1000,1,2025-04-01\n"
+        )
+
+        resp = client.post(
+            "/api/deductions/bulk",
+            data={"file": (io.BytesIO(csv.encode()), "deductions.csv")},
+            headers=auth_headers,
+            content_type="multipart/form-data",
+        )
+
+        assert resp.status_code == 200
+        data = resp.get_json()["data"]
+        assert (data["success_count"], data["error_count"]) == (1, 1)
+        assert data["errors"] == ["Row 2: Employee 99999999 not found"]
+        ded = Deduction.query.filter_by(employee_id=emp.employee_id).one()
+        assert (ded.deduction_type, float(ded.total_amount), ded.months) == ("Uniform", 3000.0, 3)
+        assert ded.start_month == date(2025, 4, 1)
@@ -0,0 +1,126 @@
+"""
+test_employee_import.py — Tests for bulk_import_from_frames.
+
+Verifies that:
+  - Valid rows are inserted in bulk together with their bank account details
+  - Rows failing payload validation are reported without blocking the rest
+  - A row rejected by the database is reported on its own, not with its whole batch
+  - Cell values are coerced the same way for old- and new-format sheets
+  - A sheet with many rows imports completely (size set by BULK_IMPORT_ROWS)
+"""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from models.account_details import AccountDetails
+from models.employee import Employee
+from models.wage_master import WageMaster
+from services.employee_service import bulk_import_from_frames
+
+pytestmark = pytest.mark.db
+
+
+@pytest.fixture()
+def salary_code(db):
+    wm = WageMaster(
+        salary_code="IMPGUARDUP", site_name="Import Site", rank="Guard",
+        state="UP", base_wage=600.0, skill_level="Skilled",
+    )
+    db.session.add(wm)
+    db.session.commit()
+    return wm.salary_code
+
+
+def new_format_frame(rows):
+    columns = ["Full Name", "Salary Code", "Aadhaar Number", "Marital Status",
+               "Bank Account Number", "IFSC Code", "Bank Name"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+class TestBulkImportFromFrames:
+
+    def test_inserts_employees_and_accounts(self, db, salary_code):
+        df = new_format_frame([
+            ["Asha Devi", salary_code, "IMP000000001", "Married", "1234567890", "SBIN0000001", "SBI"],
+            ["Ravi", salary_code, "IMP000000002", None, None, None, None],
+        ])
+
+        summary = bulk_import_from_frames({"Sheet1": df})
+
+        assert summary == {"inserted": 2, "errors": []}
+        asha = Employee.query.filter_by(adhar_number="IMP000000001").one()
+        assert (asha.first_name, asha.last_name, asha.salary_code) == ("Asha", "Devi", salary_code)
+        assert asha.nationality == "Indian" and asha.is_deleted is False
+        accounts = AccountDetails.query.filter_by(emp_id=asha.employee_id).all()
+        assert [a.account_number for a in accounts] == ["1234567890"]
+        ravi = Employee.query.filter_by(adhar_number="IMP000000002").one()
+        assert AccountDetails.query.filter_by(emp_id=ravi.employee_id).count() == 0
+
+    def test_validation_errors_reported_per_row(self, db, salary_code):
+        df = new_format_frame([
+            ["Good Row", salary_code, "IMP000000003", None, None, None, None],
+            ["Bad Code", "NOPE", "IMP000000004", None, None, None, None],
+        ])
+
+        summary = bulk_import_from_frames({"Sheet1": df})
+
+        assert summary["inserted"] == 1
+        assert [(e["sheet"], e["row_index"]) for e in summary["errors"]] == [("Sheet1", 1)]
+        assert "Invalid salary code" in summary["errors"][0]["error"]
+
+    def test_database_rejection_isolated_to_row(self, db, salary_code):
+        df = new_format_frame([
+            ["First Ok", salary_code, "IMP000000005", "Single", None, None, None],
+            ["Bad Status", salary_code, "IMP000000006", "Complicated", None, None, None],
+            ["Third Ok", salary_code, "IMP000000007", None, None, None, None],
+        ])
+
+        summary = bulk_import_from_frames({"Sheet1": df})
+
+        assert summary["inserted"] == 2
+        assert [e["row_index"] for e in summary["errors"]] == [1]
+        assert Employee.query.filter(
+            Employee.adhar_number.in_(["IMP000000005", "IMP000000006", "IMP000000007"])
+        ).count() == 2
+
+    def test_cell_values_coerced_per_format(self, db, salary_code):
+        new_df = pd.DataFrame(
+            [["  Meena Kumari ", salary_code, "IMP000000008", "Yes", 0, "Nepali"]],
+            columns=["Full Name", "Salary Code", "Aadhaar Number",
+                     "PF Applicability", "ESIC Applicability", "Nationality"],
+        )
+        old_df = pd.DataFrame(
+            [["Old Format", "1990-05-01", "Male", "Import Site", "Guard", "UP", 600]],
+            columns=["Full Name", "Date of Birth", "Gender", "Site Name", "Rank", "State", "Base Salary"],
+        )
+
+        summary = bulk_import_from_frames([("New", new_df), ("Old", old_df)])
+
+        assert summary == {"inserted": 2, "errors": []}
+        meena = Employee.query.filter_by(adhar_number="IMP000000008").one()
+        assert (meena.first_name, meena.last_name) == ("Meena", "Kumari")
+        assert meena.nationality == "Nepali"
+        assert meena.pf_applicability is True and meena.esic_applicability is False
+        assert meena.marital_status is None
+        old = Employee.query.filter_by(first_name="Old", last_name="Format").one()
+        assert (old.gender, old.salary_code) == ("Male", salary_code)
+        assert str(old.date_of_birth) == "1990-05-01"
+
+    @pytest.mark.slow
+    def test_large_sheet_imports_every_row(self, db, salary_code):
+        n = int(os.environ.get("BULK_IMPORT_ROWS", "500"))
+        seq = pd.Series(np.arange(n)).astype(str)
+        df = new_format_frame({
+            "Full Name": "Bulk " + seq,
+            "Salary Code": salary_code,
+            "Aadhaar Number": "BLK" + seq.str.zfill(9),
+            "Marital Status": np.where(np.arange(n) % 2, "Married", "Single"),
+            "Bank Account Number": None,
+            "IFSC Code": None,
+            "Bank Name": None,
+        })
+
+        summary = bulk_import_from_frames({"Sheet1": df})
+
+        assert summary == {"inserted": n, "errors": []}
+        assert Employee.query.filter(Employee.adhar_number.like("BLK%")).count() == n
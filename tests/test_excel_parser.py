@@ -0,0 +1,119 @@
+"""
+test_excel_parser.py — Tests for employee Excel upload parsing helpers.
+
+Verifies that:
+  - detect_excel_engine picks the engine from the file's magic bytes
+  - detect_excel_format classifies old / new / basic templates, caching per header row
+  - iter_excel_frames / load_excel_to_frames skip empty sheets and validate columns
+  - load_excel_to_frames validates from header rows before parsing any sheet in full
+"""
+import io
+from unittest.mock import patch
+import pandas as pd
+import pytest
+from utils.excel_parser import (
+    _detect_format_by_columns, detect_excel_engine, detect_excel_format, iter_excel_frames, load_excel_to_frames,
+)
+
+
+def make_xlsx(data):
+    """Helper: build an in-memory .xlsx workbook from a column dict."""
+    buf = io.BytesIO()
+    pd.DataFrame(data).to_excel(buf, index=False, engine="openpyxl")
+    buf.seek(0)
+    return buf
+
+
+class TestDetectExcelEngine:
+
+    def test_xlsx_bytes_select_openpyxl(self):
+        buf = make_xlsx({"Full Name": ["A"]})
+        buf.seek(10)
+        assert detect_excel_engine(buf) == "openpyxl"
+        assert buf.tell() == 0, "File position must be rewound for the reader"
+
+    def test_ole2_bytes_select_xlrd(self):
+        assert detect_excel_engine(io.BytesIO(b"\xd0\xcf\x11\xe0" + b"\x00" * 60)) == "xlrd"
+
+    def test_unknown_bytes_return_none(self):
+        assert detect_excel_engine(io.BytesIO(b"Full Name,Rank\n")) is None
+
+    def test_accepts_file_path(self, tmp_path):
+        path = tmp_path / "upload.xlsx"
+        path.write_bytes(make_xlsx({"Full Name": ["A"]}).getvalue())
+        assert detect_excel_engine(str(path)) == "openpyxl"
+
+
+class TestDetectExcelFormat:
+
+    @pytest.mark.parametrize("columns,expected", [
+        (["Full Name", "Site Name", "Rank", "State", "Base Salary"], "old"),
+        (["Full Name", "Salary Code"], "new"),
+        ([" Full Name ", "Aadhaar Number"], "new"),
+        (["Full Name", "Site Name", "Rank", "State", "Base Salary", "Salary Code"], "new"),
+        (["Full Name", "Site Name", "Rank", "State", "Base Salary", "Marital Status"], "old"),
+        (["Full Name"], "basic"),
+    ])
+    def test_classifies_templates(self, columns, expected):
+        assert detect_excel_format(pd.DataFrame(columns=columns)) == expected
+
+    def test_repeated_template_reuses_cached_result(self):
+        columns = ["Full Name", "Salary Code", "Cached Template Marker"]
+        detect_excel_format(pd.DataFrame(columns=columns))
+        hits = _detect_format_by_columns.cache_info().hits
+        assert detect_excel_format(pd.DataFrame([["A", "X", 1]], columns=columns)) == "new"
+        assert _detect_format_by_columns.cache_info().hits == hits + 1
+
+
+class TestLoadExcelFrames:
+
+    def _workbook(self, sheets):
+        buf = io.BytesIO()
+        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+            for name, data in sheets.items():
+                pd.DataFrame(data).to_excel(writer, sheet_name=name, index=False)
+        buf.seek(0)
+        return buf
+
+    def test_iter_yields_non_empty_sheets_lazily(self):
+        buf = self._workbook({
+            "First": {"Full Name": ["A", "B"], "Salary Code": ["X", "Y"]},
+            "Empty": {"Full Name": []},
+            "Second": {" Full Name ": ["C"]},
+        })
+        frames = iter_excel_frames(buf)
+        sheet, df = next(frames)
+        assert sheet == "First" and len(df) == 2
+        sheet, df = next(frames)
+        assert sheet == "Second" and list(df.columns) == ["Full Name"]
+        assert next(frames, None) is None
+
+    def test_load_rejects_sheet_missing_columns(self):
+        buf = self._workbook({"Sheet1": {"Name": ["A"]}})
+        with pytest.raises(ValueError, match="missing basic columns"):
+            load_excel_to_frames(buf)
+
+    def test_load_rejects_workbook_without_data(self):
+        buf = self._workbook({"Sheet1": {"Full Name": []}})
+        with pytest.raises(ValueError, match="No non-empty sheets"):
+            load_excel_to_frames(buf)
+
+    def test_load_strips_headers_and_skips_empty_sheets(self):
+        buf = self._workbook({
+            "First": {" Full Name ": ["A", "B"], "Salary Code": ["X", "Y"]},
+            "Empty": {"Full Name": []},
+        })
+        frames = load_excel_to_frames(buf)
+        assert list(frames) == ["First"]
+        assert list(frames["First"].columns) == ["Full Name", "Salary Code"]
+        assert len(frames["First"]) == 2
+
+    def test_load_rejects_before_parsing_any_sheet_in_full(self):
+        buf = self._workbook({
+            "Good": {"Full Name": ["A"] * 50},
+            "Bad": {"Name": ["B"]},
+        })
+        with patch.object(pd.ExcelFile, "parse", autospec=True, side_effect=pd.ExcelFile.parse) as parse:
+            with pytest.raises(ValueError, match="Sheet 'Bad' missing basic columns"):
+                load_excel_to_frames(buf)
+        assert [call.kwargs.get("nrows") for call in parse.call_args_list] == [1, 1]
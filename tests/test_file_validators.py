@@ -0,0 +1,157 @@
+"""
+test_file_validators.py — Tests for the attendance upload validators.
+
+Verifies that:
+  - validate_excel_file rejects bad extensions and oversized files without reading them
+  - validate_excel_file sniffs .xlsx uploads with openpyxl and reports corrupt archives
+  - find_employee_columns matches the ID/name header spellings
+  - validate_excel_structure names each duplicated header once
+  - validate_excel_structure warns with the number of blank rows
+  - validate_employee_data sorts IDs into empty, missing, unauthorized and valid rows
+  - validate_employee_data reports each repeated ID once as a duplicate
+  - validate_attendance_data accepts P/A/O/Present/Absent/OFF in any case, plus blanks
+  - validate_attendance_data reports each invalid cell with its Excel row and raw value
+  - validate_attendance_data skips status checks for out-of-month date columns
+"""
+import io
+from unittest.mock import patch
+import pandas as pd
+from werkzeug.datastructures import FileStorage
+from utils.file_validators import (
+    find_employee_columns, validate_attendance_data, validate_employee_data, validate_excel_file,
+    validate_excel_structure,
+)
+
+
+def make_upload(filename, size=0):
+    return FileStorage(stream=io.BytesIO(b"x" * size), filename=filename)
+
+
+class TestValidateExcelFile:
+
+    def test_bad_extension_rejected_without_reading(self):
+        with patch("utils.file_validators.pd.read_excel") as read_excel:
+            is_valid, errors = validate_excel_file(make_upload("roster.csv"))
+
+        assert not is_valid
+        assert errors == ["Invalid file type '.csv'. Only .xlsx and .xls files are allowed."]
+        read_excel.assert_not_called()
+
+    def test_oversized_file_rejected_without_reading(self):
+        with patch("utils.file_validators.pd.read_excel") as read_excel:
+            is_valid, errors = validate_excel_file(make_upload("roster.xlsx", 2 * 1024 * 1024), max_size_mb=1)
+
+        assert not is_valid
+        assert errors == ["File size 2.00 MB exceeds the 1 MB limit."]
+        read_excel.assert_not_called()
+
+    def test_readable_workbook_accepted(self):
+        buf = io.BytesIO()
+        pd.DataFrame({"Employee ID": ["101"]}).to_excel(buf, index=False)
+        buf.seek(0)
+
+        with patch("utils.file_validators.pd.read_excel") as read_excel:
+            is_valid, errors = validate_excel_file(FileStorage(stream=buf, filename="roster.xlsx"))
+
+        assert is_valid
+        assert errors == []
+        read_excel.assert_not_called()
+        assert buf.tell() == 0
+
+    def test_corrupt_xlsx_reported(self):
+        upload = FileStorage(stream=io.BytesIO(b"PK\x03\x04 not a workbook"), filename="roster.xlsx")
+
+        is_valid, errors = validate_excel_file(upload)
+
+        assert not is_valid
+        assert errors[0].startswith("File appears to be corrupted or unreadable")
+
+
+class TestFindEmployeeColumns:
+
+    def test_flexible_header_spellings(self):
+        assert find_employee_columns(["Emp_ID", "Skill Level", "Emp Name", "01/08/2025"]) == ("Emp_ID", "Emp Name")
+
+    def test_missing_columns_are_none(self):
+        assert find_employee_columns(["Skill Level", "01/08/2025"]) == (None, None)
+
+
+class TestValidateExcelStructure:
+
+    def test_duplicate_headers_reported_once(self):
+        df = pd.DataFrame(
+            [["101", "Asha", "P", "P", "A"]],
+            columns=["Employee ID", "Employee Name", "01/08/2025", "01/08/2025 ", "01/08/2025"],
+        )
+
+        is_valid, errors, _ = validate_excel_structure(df)
+
+        assert not is_valid
+        assert errors == ["Duplicate column names found: 01/08/2025"]
+
+    def test_empty_rows_counted_in_warning(self):
+        df = pd.DataFrame({
+            "Employee ID": ["101", None, None],
+            "Employee Name": ["Asha", None, None],
+            "01/08/2025": ["P", None, None],
+        })
+
+        is_valid, errors, warnings = validate_excel_structure(df)
+
+        assert is_valid
+        assert warnings == ["2 completely empty row(s) found and will be skipped."]
+
+
+class TestValidateEmployeeData:
+
+    def test_rows_classified_by_id(self):
+        df = pd.DataFrame({"Employee ID": ["101", " 102 ", None, "nan", "999", "103"]})
+        employee_dict = {"101": object(), "102": object(), "103": None}
+
+        results = validate_employee_data(df, "Employee ID", employee_dict, "supervisor", 1)
+
+        assert results["valid_employees"] == ["101", "102"]
+        assert [e["row"] for e in results["empty_employee_ids"]] == [4, 5]
+        assert [(e["row"], e["employee_id"]) for e in results["missing_employees"]] == [(6, "999")]
+        assert [(e["row"], e["employee_id"]) for e in results["unauthorized_employees"]] == [(7, "103")]
+
+    def test_repeated_ids_reported_once(self):
+        df = pd.DataFrame({"Employee ID": ["101", "102", "101", "101", "", ""]})
+
+        results = validate_employee_data(df, "Employee ID", {"101": object(), "102": object()}, "admin", None)
+
+        assert results["duplicate_employees"] == ["101"]
+        assert results["valid_employees"] == ["101", "102", "101", "101"]
+
+
+class TestValidateAttendanceData:
+
+    def test_valid_statuses_pass(self):
+        df = pd.DataFrame({"01/08/2025": ["P", " a ", "off", "Present", "", None]})
+
+        results = validate_attendance_data(df, ["01/08/2025"], 8, 2025)
+
+        assert results["valid_dates"] == ["01/08/2025"]
+        assert results["invalid_statuses"] == []
+
+    def test_invalid_cells_reported_with_excel_row(self):
+        df = pd.DataFrame({
+            "01/08/2025": ["P", "X", "A"],
+            "02/08/2025": ["H", "P", 1],
+        })
+
+        results = validate_attendance_data(df, ["01/08/2025", "02/08/2025"], 8, 2025)
+
+        assert [(e["row"], e["column"], e["value"]) for e in results["invalid_statuses"]] == [
+            (3, "01/08/2025", "X"),
+            (2, "02/08/2025", "H"),
+            (4, "02/08/2025", 1),
+        ]
+
+    def test_out_of_month_columns_not_checked(self):
+        df = pd.DataFrame({"01/09/2025": ["X"]})
+
+        results = validate_attendance_data(df, ["01/09/2025"], 8, 2025)
+
+        assert results["month_mismatch"] is True
+        assert results["invalid_statuses"] == []
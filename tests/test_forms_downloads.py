@@ -0,0 +1,32 @@
+"""
+test_forms_downloads.py — Tests for the Form B/C/D Excel downloads.
+
+Verifies that:
+  - Each download returns a workbook whose title block fills rows 1-5
+  - Column headers start on row 6, directly under the title block
+"""
+import io
+import openpyxl
+import pytest
+from .conftest import make_employee
+
+pytestmark = pytest.mark.db
+
+
+class TestFormDownloads:
+
+    @pytest.mark.parametrize("form, title, first_header", [
+        ("form-b", "Form B", "Sl.No"),
+        ("form-c", "Form C", "Sl.No"),
+        ("form-d", "Form D", "Sl. No."),
+    ])
+    def test_title_block_above_table(self, client, auth_headers, db, form, title, first_header):
+        make_employee(db)
+
+        resp = client.get(f"/api/forms/{form}/download?year=2025&month=1", headers=auth_headers)
+
+        assert resp.status_code == 200
+        ws = openpyxl.load_workbook(io.BytesIO(resp.data)).active
+        assert ws["A1"].value == title
+        assert ws["A6"].value == first_header
+        assert {str(r).split(":")[0] for r in ws.merged_cells.ranges} == {"A1", "A2", "A3", "A4", "A5"}
@@ -0,0 +1,26 @@
+"""
+test_pdf_service.py — Tests for payslip PDF generation.
+
+Verifies that:
+  - generate_payroll_pdf renders a PDF in memory with whichever backend is installed
+  - Repeated calls keep working once the backends have been probed at import
+"""
+from services.pdf_service import generate_payroll_pdf
+
+
+PAYSLIP_HTML = """
+<html><head><style>.payslip { margin: 0 1%; }</style></head><body>
+<div class="payslip"><h3>PAYSLIP FOR MARCH 2025</h3>
+<p><strong>ID:</strong> 91510001</p><p><strong>Name:</strong> Test Worker</p>
+</div>
+</body></html>
+"""
+
+
+class TestGeneratePayrollPdf:
+
+    def test_repeated_calls_produce_pdfs(self):
+        for _ in range(2):
+            pdf_buffer = generate_payroll_pdf(PAYSLIP_HTML)
+            assert pdf_buffer.tell() == 0
+            assert pdf_buffer.read(4) == b"%PDF"
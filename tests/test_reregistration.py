@@ -14,6 +14,8 @@ import pytest
 from models.employee import Employee
 from .conftest import make_employee
 
+pytestmark = pytest.mark.db
+
 
 # Minimal registration payload factory
 def reg_payload(**overrides):
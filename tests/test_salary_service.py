@@ -0,0 +1,116 @@
+"""
+test_salary_service.py — Tests for the bulk helpers in SalaryService.
+
+Verifies that:
+  - get_bulk_daily_wages follows the same precedence as get_employee_daily_wage
+  - get_bulk_overtime_shifts sums a month's overtime per employee in one query
+  - calculate_overtime_allowance uses prefetched values when supplied
+  - calculate_salary_from_attendance_data fills overtime columns for every row
+  - calculate_salary_from_attendance_data counts present days and statutory
+    deductions per row, falling back to the default wage for unknown employees
+"""
+import pytest
+import pandas as pd
+from datetime import date, datetime
+from models.attendance import Attendance
+from services.salary_service import SalaryService
+from .conftest import make_employee
+
+pytestmark = pytest.mark.db
+
+
+def add_attendance(db_session, employee_id, day, overtime_shifts):
+    """Helper: stage an attendance row with overtime."""
+    db_session.session.add(Attendance(
+        employee_id=employee_id,
+        attendance_date=day,
+        attendance_status="Present",
+        overtime_shifts=overtime_shifts,
+    ))
+
+
+class TestBulkLookups:
+
+    def test_bulk_daily_wages_match_single_lookup(self, db):
+        rated = make_employee(db, wage_rate=700.0)
+        skilled = make_employee(db, skill_category="Skilled")
+        plain = make_employee(db)
+
+        wages = SalaryService.get_bulk_daily_wages([rated.employee_id, skilled.employee_id, plain.employee_id])
+
+        for emp in (rated, skilled, plain):
+            assert wages[emp.employee_id] == SalaryService.get_employee_daily_wage(emp.employee_id)
+        assert wages[rated.employee_id] == 700.0
+        assert wages[skilled.employee_id] == 739.0
+
+    def test_bulk_overtime_shifts_groups_by_employee(self, db):
+        busy = make_employee(db)
+        idle = make_employee(db)
+        add_attendance(db, busy.employee_id, date(2025, 3, 3), 1.5)
+        add_attendance(db, busy.employee_id, date(2025, 3, 4), 0.5)
+        add_attendance(db, busy.employee_id, date(2025, 4, 1), 3.0)
+        db.session.commit()
+
+        shifts = SalaryService.get_bulk_overtime_shifts([busy.employee_id, idle.employee_id], 2025, 3)
+
+        assert shifts == {busy.employee_id: 2.0, idle.employee_id: 0.0}
+
+    def test_overtime_allowance_uses_prefetched_values(self, db):
+        emp = make_employee(db, wage_rate=800.0)
+
+        allowance, shifts, hours, rate = SalaryService.calculate_overtime_allowance(
+            emp.employee_id, 2025, 3, daily_wage=640.0, overtime_shifts=2.0
+        )
+
+        assert (allowance, shifts, hours, rate) == (1280.0, 2.0, 16.0, 80.0)
+
+
+class TestSalaryFromAttendanceData:
+
+    def test_overtime_columns_filled_for_all_rows(self, db):
+        today = datetime.now().date()
+        worker = make_employee(db, wage_rate=800.0)
+        other = make_employee(db, wage_rate=400.0)
+        add_attendance(db, worker.employee_id, today.replace(day=1), 1.0)
+        db.session.commit()
+
+        df = pd.DataFrame({
+            "Employee ID": [str(worker.employee_id), str(other.employee_id)],
+            "Employee Name": ["Worker", "Other"],
+            "Skill Level": ["Skilled", "Skilled"],
+            "Monday 1": ["P", "P"],
+            "Tuesday 2": ["P", "A"],
+        })
+
+        result = SalaryService.calculate_salary_from_attendance_data(df)
+
+        assert result["success"] is True, result
+        by_id = {row["Employee ID"]: row for row in result["data"]}
+        assert by_id[str(worker.employee_id)]["Overtime Allowance"] == 800.0
+        assert by_id[str(other.employee_id)]["Overtime Allowance"] == 0.0
+        assert by_id[str(worker.employee_id)]["Basic"] == 1600.0
+
+    def test_present_days_and_statutory_deductions(self, db):
+        worker = make_employee(db, wage_rate=1000.0)
+        db.session.commit()
+
+        df = pd.DataFrame({
+            "Employee ID": [f" {worker.employee_id} ", "UNKNOWN"],
+            "Employee Name": ["Worker", "Stranger"],
+            "Skill Level": ["Skilled", "Skilled"],
+            "Monday 1": [" p", "P"],
+            "Tuesday 2": ["P", None],
+            "Wednesday 3": ["A", "A"],
+        })
+        df = pd.concat([df] + [
+            pd.DataFrame({f"Thursday {d}": ["P", "A"]}) for d in range(4, 24)
+        ], axis=1)
+
+        result = SalaryService.calculate_salary_from_attendance_data(df)
+
+        assert result["success"] is True, result
+        worker_row, stranger_row = result["data"]
+        assert (worker_row["Present Days"], worker_row["Basic"]) == (22, 22000.0)
+        assert worker_row["PF"] == pytest.approx(0.12 * 15000)
+        assert worker_row["ESIC"] == pytest.approx(0.0075 * 21000)
+        assert (stranger_row["Present Days"], stranger_row["Daily Wage"]) == (1, 526.0)
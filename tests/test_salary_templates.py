@@ -0,0 +1,28 @@
+"""
+test_salary_templates.py — Tests for the salary upload template downloads.
+
+Verifies that:
+  - GET /salary/template/attendance returns a readable workbook with the sample rows
+  - GET /salary/template/adjustments returns a readable workbook with the sample rows
+  - Repeated downloads return identical content
+"""
+import io
+import pandas as pd
+import pytest
+
+
+class TestSalaryTemplates:
+
+    @pytest.mark.parametrize("path,sheet,first_columns", [
+        ("/api/salary/template/attendance", "Attendance", ["Employee ID", "Employee Name", "Skill Level", "Monday"]),
+        ("/api/salary/template/adjustments", "Adjustments", ["Employee ID", "Special Basic", "DA", "HRA"]),
+    ])
+    def test_template_workbook(self, client, path, sheet, first_columns):
+        resp = client.get(path)
+        assert resp.status_code == 200
+        assert "spreadsheetml" in resp.headers["Content-Type"]
+
+        df = pd.read_excel(io.BytesIO(resp.data), sheet_name=sheet)
+        assert list(df.columns[:4]) == first_columns
+        assert df["Employee ID"].tolist() == ["EMP001", "EMP002", "EMP003"]
+        assert client.get(path).data == resp.data
@@ -15,6 +15,8 @@ from .conftest import make_employee
 import uuid
 from datetime import date
 
+pytestmark = pytest.mark.db
+
 
 class TestSoftDelete:
     """Tests for soft delete functionality."""
@@ -0,0 +1,43 @@
+"""
+test_superadmin_routes.py — Route registration checks for the superadmin blueprint.
+
+Verifies that:
+  - superadmin_bp exposes the user-management endpoints with the expected methods
+  - The endpoints are mounted under /api in the full application
+
+The blueprint checks use a bare Flask scaffold so they run without the
+database engine or the rest of the blueprint chain.
+"""
+import pytest
+from flask import Flask
+
+from routes.superadmin import superadmin_bp
+
+
+EXPECTED_RULES = {
+    ("/api/superadmin/users", "GET"),
+    ("/api/superadmin/users", "POST"),
+    ("/api/superadmin/users/<user_id>", "PUT"),
+    ("/api/superadmin/users/<user_id>", "DELETE"),
+}
+
+
+def _rule_methods(flask_app):
+    return {
+        (rule.rule, method)
+        for rule in flask_app.url_map.iter_rules()
+        for method in rule.methods - {"HEAD", "OPTIONS"}
+    }
+
+
+class TestSuperadminBlueprint:
+    """superadmin_bp must register its routes on its own."""
+
+    def test_blueprint_registers_user_routes(self):
+        scaffold = Flask(__name__)
+        scaffold.register_blueprint(superadmin_bp, url_prefix="/api")
+        assert EXPECTED_RULES <= _rule_methods(scaffold)
+
+    @pytest.mark.integration
+    def test_full_app_mounts_user_routes(self, app):
+        assert EXPECTED_RULES <= _rule_methods(app)
@@ -1,16 +1,34 @@
 
+import numpy as np
 import pandas as pd
 import re
 import math
-from datetime import datetime
+from datetime import datetime, date
+from functools import lru_cache
+from io import StringIO
 import os
 from models.employee import Employee
+from models.attendance import Attendance
 
 
 """
 Date utility functions for attendance processing
 """
 
+# Header formats shared by is_date and parse_date_from_column, compiled once
+DATETIME_PATTERNS = (
+    re.compile(r'^(\d{4})-(\d{2})-(\d{2})\s\d{2}:\d{2}:\d{2}$'),  # 2025-08-01 00:00:00
+    re.compile(r'^(\d{4})-(\d{2})-(\d{2})$'),                      # 2025-08-01
+)
+DAY_FIRST_PATTERNS = (
+    re.compile(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$'),  # dd/mm/yyyy or dd-mm-yyyy
+    re.compile(r'^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$'),  # dd/mm/yy or dd-mm-yy
+)
+
+
+# Column headers repeat across the validation passes of one upload and across
+# uploads of the same template, so both header parsers are memoized
+@lru_cache(maxsize=1024)
 def is_date(col):
     """Check if column name represents a date"""
     # Handle None or NaN values
@@ -21,43 +39,36 @@ def is_date(col):
     if isinstance(col, (datetime, pd.Timestamp)):
         return True
 
+    # Numeric headers never match a date pattern; skip the str() round-trip
+    if isinstance(col, (int, float, np.number)):
+        return False
+
     # Convert to string and clean up
     try:
         col_str = str(col).strip()
     except:
         return False
 
-    # Skip empty strings or common non-date columns
-    if not col_str or col_str.lower() in ['employee id', 'employee name', 'skill level', 'emp id', 'name', 'nan', '']:
+    # Cheap pre-reject before any regex: every accepted format is 6-19 chars
+    # long and starts with a digit, which rules out headers like "Employee ID"
+    if not (6 <= len(col_str) <= 19) or not col_str[0].isdigit():
         return False
 
     # Check if it's a datetime string format (from pandas parsing)
     # Pattern for "YYYY-MM-DD HH:MM:SS" or "YYYY-MM-DD"
-    datetime_patterns = [
-        r'^\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2}$',  # 2025-08-01 00:00:00
-        r'^\d{4}-\d{2}-\d{2}$',                      # 2025-08-01
-    ]
-    
-    for pattern in datetime_patterns:
-        if re.match(pattern, col_str):
+    for pattern in DATETIME_PATTERNS:
+        if pattern.match(col_str):
             try:
-                # Try to parse as datetime
-                if ' ' in col_str:
-                    datetime.strptime(col_str, '%Y-%m-%d %H:%M:%S')
-                else:
-                    datetime.strptime(col_str, '%Y-%m-%d')
+                # The pattern already pins the layout, so the C ISO parser only
+                # has to validate the values (much cheaper than strptime)
+                datetime.fromisoformat(col_str)
                 return True
             except ValueError:
                 continue
 
     # Pattern for dd/mm/yyyy, dd-mm-yyyy formats (original logic)
-    date_patterns = [
-        r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$',  # dd/mm/yyyy or dd-mm-yyyy
-        r'^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$',   # dd/mm/yy or dd-mm-yy
-    ]
-    
-    for pattern in date_patterns:
-        match = re.match(pattern, col_str)
+    for pattern in DAY_FIRST_PATTERNS:
+        match = pattern.match(col_str)
         if match:
             try:
                 day_str, month_str, year_str = match.groups()
@@ -82,6 +93,7 @@ def is_date(col):
     return False
 
 
+@lru_cache(maxsize=1024)
 def parse_date_from_column(col):
     """Parse date from column name"""
     # Handle None or NaN values
@@ -92,19 +104,22 @@ def parse_date_from_column(col):
     if isinstance(col, (datetime, pd.Timestamp)):
         return col.year, col.month, col.day
 
+    # Same numeric fast exit as is_date
+    if isinstance(col, (int, float, np.number)):
+        return None, None, None
+
     try:
         col_str = str(col).strip()
     except:
         return None, None, None
+
+    # Same pre-reject as is_date
+    if not (6 <= len(col_str) <= 19) or not col_str[0].isdigit():
+        return None, None, None
     
     # Check if it's a datetime string format (from pandas parsing)
-    datetime_patterns = [
-        r'^(\d{4})-(\d{2})-(\d{2})\s\d{2}:\d{2}:\d{2}$',  # 2025-08-01 00:00:00
-        r'^(\d{4})-(\d{2})-(\d{2})$',                      # 2025-08-01
-    ]
-    
-    for pattern in datetime_patterns:
-        match = re.match(pattern, col_str)
+    for pattern in DATETIME_PATTERNS:
+        match = pattern.match(col_str)
         if match:
             try:
                 year_str, month_str, day_str = match.groups()
@@ -123,13 +138,8 @@ def parse_date_from_column(col):
                 continue
     
     # Pattern for dd/mm/yyyy, dd-mm-yyyy formats (original logic)
-    date_patterns = [
-        r'^(\d{1,2})[/-](\d{1,2})[/-](\d{4})$',  # dd/mm/yyyy or dd-mm-yyyy
-        r'^(\d{1,2})[/-](\d{1,2})[/-](\d{2})$',   # dd/mm/yy or dd-mm-yy
-    ]
-    
-    for pattern in date_patterns:
-        match = re.match(pattern, col_str)
+    for pattern in DAY_FIRST_PATTERNS:
+        match = pattern.match(col_str)
         if match:
             try:
                 day_str, month_str, year_str = match.groups()
@@ -154,6 +164,37 @@ def parse_date_from_column(col):
     return None, None, None
 
 
+# Normalized headers (lower case, no spaces/underscores) the attendance upload reads besides dates
+ATTENDANCE_UPLOAD_HEADERS = frozenset({
+    'employeeid', 'empid', 'id',
+    'employeename', 'name', 'empname',
+    'skilllevel', 'overtime',
+})
+
+
+def is_attendance_upload_column(col):
+    """
+    usecols filter for attendance sheets: keep ID/name, Skill Level, Overtime and date columns
+    Any other column is dropped while the workbook is parsed
+    """
+    if is_date(col):
+        return True
+    return str(col).strip().lower().replace(' ', '').replace('_', '') in ATTENDANCE_UPLOAD_HEADERS
+
+
+def parse_date_columns(columns):
+    """
+    Map each column header that names a valid date to that date
+    Parses every header once, so upload loops can look dates up per cell
+    """
+    dates = {}
+    for col in columns:
+        year, month, day = parse_date_from_column(col)
+        if year and month and day:
+            dates[col] = date(year, month, day)
+    return dates
+
+
 """
 Attendance utility functions for processing and validation
 """
@@ -168,30 +209,72 @@ STATUS_MAP = {
     'OFF': 'OFF'
 }
 
+# STATUS_MAP keyed by upper-cased cell text, so every spelling is a single lookup
+NORMALIZED_STATUS = {k.upper(): v for k, v in STATUS_MAP.items()}
+
 
 def round_to_half(x):
     """Round to nearest 0.5 increment"""
     return round(x * 2) / 2.0
 
 
+def parse_overtime_column(series):
+    """
+    Parse a whole 'Overtime' column of monthly shift counts at once
+    Blank, non-numeric or non-finite cells become 0.0; the rest are rounded to the nearest 0.5
+    """
+    shifts = pd.to_numeric(series.astype(str).str.strip(), errors='coerce')
+    shifts = shifts.where(np.isfinite(shifts))
+    return (np.round(shifts * 2) / 2.0).fillna(0.0)
+
+
 def normalize_attendance_value(value):
     """Normalize attendance value and return the mapped status"""
     if not value or pd.isna(value):
         return None
 
-    # Convert to string and clean up
-    v = str(value).strip().upper()
-
-    # Handle common variations
-    if v in ['P', 'PRESENT']:
-        return 'Present'
-    elif v in ['A', 'ABSENT']:
-        return 'Absent'
-    elif v in ['O', 'OFF']:
-        return 'OFF'
-    else:
-        # Try original mapping as fallback
-        return STATUS_MAP.get(v.title())
+    return NORMALIZED_STATUS.get(str(value).strip().upper())
+
+
+def normalize_attendance_series(series):
+    """
+    Normalize a whole column of attendance cells at once
+    Blank, missing and unrecognised cells become NaN
+    """
+    return series.astype(str).str.strip().str.upper().map(NORMALIZED_STATUS)
+
+
+# Python-side column defaults of the attendance table; COPY bypasses SQLAlchemy, so they are filled in here
+ATTENDANCE_COPY_DEFAULTS = {
+    column.name: column.default.arg
+    for column in Attendance.__table__.columns
+    if column.default is not None and column.default.is_scalar
+}
+
+
+def _copy_text(value):
+    """Render one value in PostgreSQL COPY text format"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def build_attendance_copy_buffer(records):
+    """
+    Serialize attendance insert mappings for COPY attendance (...) FROM STDIN
+    Returns: (columns: list[str], buffer: StringIO positioned at the start)
+    """
+    columns = list(dict.fromkeys([*records[0], *ATTENDANCE_COPY_DEFAULTS]))
+    buffer = StringIO()
+    for record in records:
+        buffer.write('\t'.join(
+            _copy_text(record[col] if col in record else ATTENDANCE_COPY_DEFAULTS[col])
+            for col in columns
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    return columns, buffer
 
 """
 Validation utilities for attendance data
@@ -222,7 +305,8 @@ def validate_file_type(filename):
 
 def validate_required_columns(df, required_columns):
     """Validate that required columns are present in DataFrame"""
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    present = set(df.columns)
+    missing_columns = [col for col in required_columns if col not in present]
     
     if missing_columns:
         return False, f"Missing required columns: {', '.join(missing_columns)}"
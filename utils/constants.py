@@ -5,6 +5,9 @@ SKILL_LEVELS = [
     'Un-Skilled'
 ]
 
+# Membership checks; SKILL_LEVELS keeps the display order for messages
+SKILL_LEVELS_SET = frozenset(SKILL_LEVELS)
+
 # Wage rates by skill level (as per your existing logic)
 WAGE_MAP = {
     'Highly Skilled': 868.00,
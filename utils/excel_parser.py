@@ -1,3 +1,6 @@
+import os
+from functools import lru_cache
+
 import pandas as pd
 
 # Basic required columns that should be present in any format
@@ -11,75 +14,129 @@ OLD_FORMAT_REQUIRED_COLUMNS = [
     "Site Name", "Rank", "State", "Base Salary"
 ]
 
-# New format required columns (comprehensive employee data)
-NEW_FORMAT_REQUIRED_COLUMNS = [
-    "Full Name", "Marital Status",
-    "Permanent Address", "Mobile Number", "Aadhaar Number",
-    "PAN Card Number", "Date of Joining", "Employment Type",
-    "Department", "Designation", "Work Location", "Salary Code"
-]
+# Header markers used to tell the templates apart
+SALARY_CODE_COLUMNS = frozenset({"Salary Code", "Salary_Code", "SalaryCode"})
+OLD_FORMAT_MARKERS = frozenset({"Site Name", "Rank", "State", "Base Salary"})
+NEW_FORMAT_MARKERS = frozenset({"Marital Status", "Aadhaar Number", "PAN Card Number"})
+
+# Leading bytes of the two Excel container formats
+XLSX_MAGIC = b"PK\x03\x04"              # .xlsx is a zip archive
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"         # legacy .xls is an OLE2 compound file
+
+def detect_excel_engine(source):
+    """
+    Pick the pandas engine for an Excel upload from its magic bytes
+    Accepts a file path or a seekable file object (position is restored to 0)
+    Returns 'openpyxl', 'xlrd', or None if the content is not recognised
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            magic = fh.read(4)
+    else:
+        source.seek(0)
+        magic = source.read(4)
+        source.seek(0)
+
+    if magic == XLSX_MAGIC:
+        return "openpyxl"
+    if magic == XLS_MAGIC:
+        return "xlrd"
+    return None
 
 def detect_excel_format(df):
     """Detect if this is the old format or new format"""
-    columns = [col.strip() for col in df.columns.tolist()]
+    return _detect_format_by_columns(tuple(df.columns))
 
-    # Check for old format indicators
-    has_old_format = all(col in columns for col in ['Site Name', 'Rank', 'State', 'Base Salary'])
-
-    # Check for new format indicators
-    has_salary_code = any(col in columns for col in ['Salary Code', 'Salary_Code', 'SalaryCode'])
-    has_comprehensive_fields = any(col in columns for col in ['Marital Status', 'Aadhaar Number', 'PAN Card Number'])
+@lru_cache(maxsize=32)
+def _detect_format_by_columns(columns: tuple) -> str:
+    """
+    Format detection keyed on the header row only, so repeated uploads of
+    the same template skip the column scan
+    """
+    columns = {col.strip() for col in columns}
 
-    if has_old_format and not has_salary_code:
+    # A salary code column always means the new format, even alongside old columns
+    if not columns.isdisjoint(SALARY_CODE_COLUMNS):
+        return 'new'
+    if OLD_FORMAT_MARKERS <= columns:
         return 'old'
-    elif has_salary_code or has_comprehensive_fields:
+    if not columns.isdisjoint(NEW_FORMAT_MARKERS):
         return 'new'
+    return 'basic'  # Has basic columns but not clearly old or new format
+
+def _validate_sheet_columns(sheet, columns):
+    """
+    Raise ValueError if a sheet's (already stripped) header row lacks the
+    columns required by its detected format
+    """
+    format_type = _detect_format_by_columns(tuple(columns))
+    columns = set(columns)
+
+    # Validate based on format
+    if format_type == 'old':
+        # Validate old format
+        missing = [c for c in OLD_FORMAT_REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f"Sheet '{sheet}' (old format) missing columns: {missing}")
+    elif format_type == 'new':
+        # For new format, only check basic required columns since some fields might be optional
+        missing = [c for c in BASIC_REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f"Sheet '{sheet}' (new format) missing basic columns: {missing}")
+
+        # Check for salary code specifically
+        if SALARY_CODE_COLUMNS.isdisjoint(columns):
+            # If no salary code, warn but don't fail (might be optional in some cases)
+            print(f"Warning: Sheet '{sheet}' doesn't have Salary Code column. Some employees might fail to import.")
     else:
-        return 'basic'  # Has basic columns but not clearly old or new format
+        # Basic format - just check basic columns
+        missing = [c for c in BASIC_REQUIRED_COLUMNS if c not in columns]
+        if missing:
+            raise ValueError(f"Sheet '{sheet}' missing basic columns: {missing}")
 
-def load_excel_to_frames(file_storage):
+def iter_excel_frames(file_storage):
     """
-    Returns dict: {sheet_name: DataFrame}
+    Yields (sheet_name, DataFrame) one sheet at a time, skipping empty sheets.
+    Only the sheet being yielded is held in memory, so large multi-sheet
+    workbooks can be fed straight into bulk_import_from_frames.
     Validates columns based on detected format.
     """
-    xls = pd.read_excel(file_storage, sheet_name=None)  # dict of dfs
-    cleaned = {}
+    xls = pd.ExcelFile(file_storage, engine=detect_excel_engine(file_storage))
 
-    for sheet, df in xls.items():
+    for sheet in xls.sheet_names:
+        df = xls.parse(sheet)
         if df.empty:
             continue
 
         # Strip headers
         df.columns = [str(c).strip() for c in df.columns]
+        _validate_sheet_columns(sheet, list(df.columns))
 
-        # Detect format
-        format_type = detect_excel_format(df)
-
-        # Validate based on format
-        if format_type == 'old':
-            # Validate old format
-            missing = [c for c in OLD_FORMAT_REQUIRED_COLUMNS if c not in df.columns]
-            if missing:
-                raise ValueError(f"Sheet '{sheet}' (old format) missing columns: {missing}")
-        elif format_type == 'new':
-            # For new format, only check basic required columns since some fields might be optional
-            missing = [c for c in BASIC_REQUIRED_COLUMNS if c not in df.columns]
-            if missing:
-                raise ValueError(f"Sheet '{sheet}' (new format) missing basic columns: {missing}")
-
-            # Check for salary code specifically
-            has_salary_code = any(col in df.columns for col in ['Salary Code', 'Salary_Code', 'SalaryCode'])
-            if not has_salary_code:
-                # If no salary code, warn but don't fail (might be optional in some cases)
-                print(f"Warning: Sheet '{sheet}' doesn't have Salary Code column. Some employees might fail to import.")
-        else:
-            # Basic format - just check basic columns
-            missing = [c for c in BASIC_REQUIRED_COLUMNS if c not in df.columns]
-            if missing:
-                raise ValueError(f"Sheet '{sheet}' missing basic columns: {missing}")
+        yield sheet, df
 
-        cleaned[sheet] = df
+def load_excel_to_frames(file_storage):
+    """
+    Returns dict: {sheet_name: DataFrame}
+    Validates every sheet before returning, so a bad sheet rejects the whole file.
+    Validation reads only each sheet's header and first row, so a rejected
+    workbook is never parsed in full.
+    """
+    xls = pd.ExcelFile(file_storage, engine=detect_excel_engine(file_storage))
+
+    sheets = []
+    for sheet in xls.sheet_names:
+        head = xls.parse(sheet, nrows=1)
+        if head.empty:
+            continue
+        _validate_sheet_columns(sheet, [str(c).strip() for c in head.columns])
+        sheets.append(sheet)
 
-    if not cleaned:
+    if not sheets:
         raise ValueError("No non-empty sheets found.")
+
+    cleaned = {}
+    for sheet in sheets:
+        df = xls.parse(sheet)
+        df.columns = [str(c).strip() for c in df.columns]
+        cleaned[sheet] = df
     return cleaned
@@ -1,7 +1,17 @@
 import os
+from collections import Counter
 import pandas as pd
+from openpyxl import load_workbook
 from datetime import date
-from utils.attendance_helpers import is_date, parse_date_from_column, normalize_attendance_value
+from utils.excel_parser import detect_excel_engine
+from utils.attendance_helpers import is_date, parse_date_from_column, normalize_attendance_value, NORMALIZED_STATUS
+
+# Upper-cased cell values accepted in attendance date columns (P/A/O, full names, or blank)
+VALID_STATUS_VALUES = frozenset(NORMALIZED_STATUS) | {''}
+
+# Normalized header spellings (lower case, no spaces/underscores) of the employee columns
+EMPLOYEE_ID_ALIASES = frozenset({'employeeid', 'empid', 'id'})
+EMPLOYEE_NAME_ALIASES = frozenset({'employeename', 'name', 'empname'})
 
 def validate_excel_file(file, max_size_mb=10):
     """
@@ -10,29 +20,53 @@ def validate_excel_file(file, max_size_mb=10):
     """
     errors = []
 
-    # Check file extension
+    # Cheap checks first: a misnamed or oversized upload is rejected without opening the workbook
     allowed_extensions = {'.xlsx', '.xls'}
     file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in allowed_extensions:
         errors.append(f"Invalid file type '{file_ext}'. Only .xlsx and .xls files are allowed.")
+        return False, errors
 
     # Check file size
     file.seek(0, os.SEEK_END)
     file_size_mb = file.tell() / (1024 * 1024)
     file.seek(0)
     if file_size_mb > max_size_mb:
-        errors.append(".2f")
+        errors.append(f"File size {file_size_mb:.2f} MB exceeds the {max_size_mb} MB limit.")
+        return False, errors
 
     # Try reading file to check if it's corrupted
     try:
-        file.seek(0)
-        test_df = pd.read_excel(file, nrows=1)
+        if detect_excel_engine(file) == 'openpyxl':
+            # .xlsx: open read-only and touch the first row, without pandas parsing the sheet
+            workbook = load_workbook(file, read_only=True, data_only=True)
+            try:
+                next(workbook.active.iter_rows(max_row=1, values_only=True), None)
+            finally:
+                workbook.close()
+        else:
+            pd.read_excel(file, nrows=1)
         file.seek(0)
     except Exception as e:
         errors.append(f"File appears to be corrupted or unreadable: {str(e)}")
 
     return len(errors) == 0, errors
 
+def find_employee_columns(columns):
+    """
+    Find the Employee ID and Employee Name columns (flexible matching)
+    Returns: (employee_id_col, employee_name_col), None where absent; the last matching header wins
+    """
+    employee_id_col = None
+    employee_name_col = None
+    for col in columns:
+        col_normalized = col.lower().replace(' ', '').replace('_', '')
+        if col_normalized in EMPLOYEE_ID_ALIASES:
+            employee_id_col = col
+        elif col_normalized in EMPLOYEE_NAME_ALIASES:
+            employee_name_col = col
+    return employee_id_col, employee_name_col
+
 def validate_excel_structure(df):
     """
     Validates Excel structure and required columns
@@ -50,41 +84,29 @@ def validate_excel_structure(df):
     df.columns = df.columns.astype(str).str.strip()
 
     # Check for required columns
-    required_columns = ['Employee ID', 'Employee Name']
-    employee_id_col = None
-    employee_name_col = None
-
-    # Find Employee ID column (flexible matching)
-    for col in df.columns:
-        col_normalized = col.lower().replace(' ', '').replace('_', '')
-        if col_normalized in ['employeeid', 'empid', 'id']:
-            employee_id_col = col
-        if col_normalized in ['employeename', 'name', 'empname']:
-            employee_name_col = col
+    employee_id_col, employee_name_col = find_employee_columns(df.columns)
 
     if not employee_id_col:
         errors.append("Required column 'Employee ID' (or 'Emp ID'/'ID') not found in Excel file.")
     if not employee_name_col:
         errors.append("Required column 'Employee Name' (or 'Name'/'Emp Name') not found in Excel file.")
 
-    # Check for date columns
-    date_columns = []
-    for col in df.columns:
-        if col not in [employee_id_col, employee_name_col, 'Skill Level', 'Overtime'] and is_date(col):
-            date_columns.append(col)
+    # Check for date columns (is_date is memoized per header)
+    non_date_columns = {employee_id_col, employee_name_col, 'Skill Level', 'Overtime'}
+    date_columns = [col for col in df.columns if col not in non_date_columns and is_date(col)]
 
     if len(date_columns) == 0:
         errors.append("No valid date columns found. Expected format: DD/MM/YYYY, DD-MM-YYYY, or datetime objects.")
 
-    # Check for duplicate column names
-    if len(df.columns) != len(set(df.columns)):
-        duplicate_cols = [col for col in df.columns if list(df.columns).count(col) > 1]
-        errors.append(f"Duplicate column names found: {', '.join(set(duplicate_cols))}")
+    # Check for duplicate column names (one counting pass over the headers)
+    duplicate_cols = [col for col, count in Counter(df.columns).items() if count > 1]
+    if duplicate_cols:
+        errors.append(f"Duplicate column names found: {', '.join(duplicate_cols)}")
 
-    # Check for completely empty rows
-    empty_rows = df[df.isna().all(axis=1)]
-    if len(empty_rows) > 0:
-        warnings.append(f"{len(empty_rows)} completely empty row(s) found and will be skipped.")
+    # Check for completely empty rows (counted from the mask; the rows themselves are not copied)
+    empty_count = int(df.isna().all(axis=1).sum())
+    if empty_count:
+        warnings.append(f"{empty_count} completely empty row(s) found and will be skipped.")
 
     return len(errors) == 0, errors, warnings
 
@@ -102,63 +124,44 @@ def validate_employee_data(df, employee_id_col, employee_dict, user_role, site_i
         'empty_employee_ids': []
     }
 
-    # Track seen employee IDs to detect duplicates
-    seen_ids = set()
-    duplicate_ids = set()
-
-    # Validate each employee
-    for idx, row in df.iterrows():
-        emp_id_raw = row[employee_id_col]
-
-        # Check for empty/null employee IDs
-        if pd.isna(emp_id_raw) or str(emp_id_raw).strip() in ['', 'nan', 'NaN', 'None']:
-            results['empty_employee_ids'].append({
-                'row': idx + 2,  # +2 because Excel is 1-indexed and has header row
-                'error': f"Empty employee ID in row {idx + 2}"
-            })
-            continue
-
-        emp_id = str(emp_id_raw).strip()
-
-        # Skip if still empty after stripping
-        if not emp_id:
-            results['empty_employee_ids'].append({
-                'row': idx + 2,
-                'error': f"Empty employee ID in row {idx + 2}"
-            })
-            continue
-
-        # Check for duplicates
-        if emp_id in seen_ids:
-            duplicate_ids.add(emp_id)
-        else:
-            seen_ids.add(emp_id)
-
-        # Check if employee exists in database
-        if emp_id not in employee_dict:
-            results['missing_employees'].append({
-                'row': idx + 2,
-                'employee_id': emp_id,
-                'error': f"Employee ID '{emp_id}' not found in database"
-            })
-        else:
-            # Check authorization (for supervisors)
-            if user_role == 'supervisor':
-                employee = employee_dict.get(emp_id)
-                if not employee:
-                    results['unauthorized_employees'].append({
-                        'row': idx + 2,
-                        'employee_id': emp_id,
-                        'error': f"Employee ID '{emp_id}' not in your assigned site"
-                    })
-                else:
-                    results['valid_employees'].append(emp_id)
+    # Classify every ID with column-wide string ops; Python only visits rows to report them
+    raw_ids = df[employee_id_col]
+    ids = raw_ids.astype(str).str.strip()
+    empty = raw_ids.isna() | ids.isin(['', 'nan', 'NaN', 'None'])
+    known = ids.isin(list(employee_dict))
+
+    for idx in ids.index[empty]:
+        results['empty_employee_ids'].append({
+            'row': idx + 2,  # +2 because Excel is 1-indexed and has header row
+            'error': f"Empty employee ID in row {idx + 2}"
+        })
+
+    # Check if employee exists in database
+    for idx, emp_id in ids[~empty & ~known].items():
+        results['missing_employees'].append({
+            'row': idx + 2,
+            'employee_id': emp_id,
+            'error': f"Employee ID '{emp_id}' not found in database"
+        })
+
+    known_ids = ids[~empty & known]
+    if user_role == 'supervisor':
+        # Check authorization (for supervisors)
+        for idx, emp_id in known_ids.items():
+            if not employee_dict.get(emp_id):
+                results['unauthorized_employees'].append({
+                    'row': idx + 2,
+                    'employee_id': emp_id,
+                    'error': f"Employee ID '{emp_id}' not in your assigned site"
+                })
             else:
                 results['valid_employees'].append(emp_id)
+    else:
+        results['valid_employees'] = known_ids.tolist()
 
-    # Convert duplicate_ids set to list for results
-    if duplicate_ids:
-        results['duplicate_employees'] = list(duplicate_ids)
+    # Non-empty IDs that appear more than once
+    present_ids = ids[~empty]
+    results['duplicate_employees'] = present_ids[present_ids.duplicated()].unique().tolist()
 
     return results
 
@@ -175,8 +178,6 @@ def validate_attendance_data(df, date_columns, month, year):
         'month_mismatch': False
     }
 
-    valid_statuses = ['P', 'A', 'O', 'Present', 'Absent', 'OFF', '']
-
     # Validate date columns
     for col in date_columns:
         year_from_col, month_from_col, day_from_col = parse_date_from_column(col)
@@ -208,18 +209,17 @@ def validate_attendance_data(df, date_columns, month, year):
                 'error': f"Invalid date: {str(e)}"
             })
 
-    # Validate attendance status values in cells
-    for col in date_columns:
-        if col in results['valid_dates']:
-            for idx, value in df[col].items():
-                if pd.notna(value):
-                    status_str = str(value).strip().upper()
-                    if status_str not in [s.upper() for s in valid_statuses]:
-                        results['invalid_statuses'].append({
-                            'row': idx + 2,
-                            'column': col,
-                            'value': value,
-                            'error': f"Invalid attendance status '{value}'. Must be P, A, O, Present, Absent, or OFF"
-                        })
+    # Validate attendance status values in cells (checked a column at a time;
+    # only the invalid cells are visited in Python)
+    for col in results['valid_dates']:
+        values = df[col]
+        invalid = values.notna() & ~values.astype(str).str.strip().str.upper().isin(VALID_STATUS_VALUES)
+        for idx, value in values[invalid].items():
+            results['invalid_statuses'].append({
+                'row': idx + 2,
+                'column': col,
+                'value': value,
+                'error': f"Invalid attendance status '{value}'. Must be P, A, O, Present, Absent, or OFF"
+            })
 
     return results
\ No newline at end of file
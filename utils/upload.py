@@ -2,6 +2,9 @@ import os
 from werkzeug.utils import secure_filename
 from config import UPLOADS_DIR, ALLOWED_EXTENSIONS
 
+# Upload folders already created by this process, so repeat saves skip makedirs
+_ensured_dirs: set[str] = set()
+
 def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -10,7 +13,9 @@ def save_file(file_storage, subfolder: str = "") -> str | None:
         return None
     fname = secure_filename(file_storage.filename)
     folder = os.path.join(UPLOADS_DIR, subfolder) if subfolder else UPLOADS_DIR
-    os.makedirs(folder, exist_ok=True)
+    if folder not in _ensured_dirs:
+        os.makedirs(folder, exist_ok=True)
+        _ensured_dirs.add(folder)
     path = os.path.join(folder, fname)
     file_storage.save(path)
     return path
@@ -1,4 +1,4 @@
-from utils.constants import SKILL_LEVELS, STATES, RANKS
+from utils.constants import SKILL_LEVELS, SKILL_LEVELS_SET
 
 def validate_wage_master_data(data, validate_skill_level=False):
     """Validate wage master data
@@ -19,7 +19,7 @@ def validate_wage_master_data(data, validate_skill_level=False):
     # Validate skill level only if requested (for employee registration)
     if validate_skill_level:
         skill_level = data.get('skill_level')
-        if skill_level and skill_level.strip() and skill_level not in SKILL_LEVELS:
+        if skill_level and skill_level.strip() and skill_level not in SKILL_LEVELS_SET:
             errors.append(f'skill_level must be one of: {", ".join(SKILL_LEVELS)}')
     
     # Validate base wage